@@ -0,0 +1,236 @@
+# backend/asgi.py
+#
+# Async serving mode: `uvicorn asgi:app`. GET list/by-id requests on every
+# uncached CRUD blueprint are answered from an asyncpg pool on the event
+# loop, so thousands of idle polling clients cost no threads or pooled
+# psycopg2 connections. Everything else (writes, streaming exports, timeline,
+# series, health, and the response-cached catalogs) is passed to the regular
+# Flask app on a thread pool, so URLs and responses match the sync server.
+#
+# Requires the optional packages asyncpg, asgiref and an ASGI server (uvicorn).
+import hashlib
+from datetime import date, datetime
+from decimal import Decimal
+from urllib.parse import parse_qsl
+from uuid import UUID
+
+import asyncpg
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask_cors.core import get_cors_headers, get_cors_options
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+from sqlalchemy.engine import make_url
+from werkzeug.datastructures import Headers, MultiDict
+from werkzeug.exceptions import HTTPException
+
+from app import create_app
+from pagination import InvalidQuery, build_list_query, encode_cursor, parse_fields
+from streaming import NDJSON_MIMETYPE
+from warmup import start_background
+
+DIALECT = PGDialect_asyncpg()
+
+
+def asyncpg_dsn(uri):
+    # postgresql+psycopg2://... -> postgresql://...
+    return make_url(uri).set(drivername='postgresql').render_as_string(hide_password=False)
+
+
+async def init_connection(conn):
+    # Accept string parameters for these types like psycopg2 does (cursor
+    # values, query-string filters) and decode to the same Python types.
+    codecs = (
+        ('uuid', str, UUID),
+        ('timestamp', str, datetime.fromisoformat),
+        ('date', str, date.fromisoformat),
+        ('numeric', str, Decimal),
+    )
+    for type_name, encoder, decoder in codecs:
+        await conn.set_type_codec(type_name, schema='pg_catalog', encoder=encoder,
+                                  decoder=decoder, format='text')
+
+
+class ThreadedWsgiInstance(WsgiToAsgiInstance):
+    # asgiref runs every WSGI request on one shared thread by default
+    # (thread_sensitive), which serializes passed-through requests and, with
+    # keep-alive, can pick up an executor left over from the previous
+    # request's send(). Flask is thread-safe: use the loop's thread pool.
+    # The body follows asgiref's run_wsgi_app, which cannot be re-wrapped
+    # without reaching into the decorator, and also closes the iterable as
+    # WSGI requires so streamed responses release their connection.
+    @sync_to_async(thread_sensitive=False)
+    def run_wsgi_app(self, body):
+        try:
+            environ = self.build_environ(self.scope, body)
+        except ValueError:
+            # More repeated headers than duplicate_header_limit
+            self.sync_send({'type': 'http.response.start', 'status': 400,
+                            'headers': [(b'content-type', b'text/plain')]})
+            self.sync_send({'type': 'http.response.body', 'body': b"Bad Request: Too many duplicate headers"})
+            return
+        output = self.wsgi_application(environ, self.start_response)
+        try:
+            for chunk in output:
+                if not self.response_started:
+                    self.response_started = True
+                    self.sync_send(self.response_start)
+                self.sync_send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        finally:
+            if hasattr(output, 'close'):
+                output.close()
+        if not self.response_started:
+            self.response_started = True
+            self.sync_send(self.response_start)
+        self.sync_send({'type': 'http.response.body'})
+
+
+class ThreadedWsgiToAsgi(WsgiToAsgi):
+    async def __call__(self, scope, receive, send):
+        await ThreadedWsgiInstance(self.wsgi_application, self.duplicate_header_limit)(scope, receive, send)
+
+
+class AsyncReadApp:
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = ThreadedWsgiToAsgi(flask_app)
+        self.routes = self._discover_routes(flask_app)
+        self.url_adapter = flask_app.url_map.bind('localhost')
+        # The options app.py's CORS(app) resolves to, so responses built
+        # here carry the same Access-Control-* headers as Flask's.
+        self.cors_options = get_cors_options(flask_app)
+        self.pool = None
+        self._compiled = {}
+
+    @staticmethod
+    def _discover_routes(flask_app):
+        # Map each CRUD blueprint's list and by-id endpoints to its Entity;
+        # any other endpoint (search, timeline, ...) goes to Flask. Cached
+        # entities go to Flask too, which serves them from the response cache.
+        routes = {}
+        for name, blueprint in flask_app.blueprints.items():
+            entity = getattr(blueprint, 'entity', None)
+            if entity is not None and not entity.cached:
+                routes[f"{name}.get_{entity.plural}"] = entity
+                routes[f"{name}.get_{entity.name}"] = entity
+        return routes
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            match = self._match(scope['path'])
+            if match is not None and not self._passthrough(scope):
+                return await self._handle(scope, send, *match)
+        return await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        config = self.flask_app.config
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                # Warms the Flask-side pool used by passed-through requests
+                # and flips GET /health/ready.
+                start_background(self.flask_app)
+                server_settings = {}
+                if config['DB_STATEMENT_TIMEOUT_MS'] > 0:
+                    server_settings['statement_timeout'] = str(config['DB_STATEMENT_TIMEOUT_MS'])
+                self.pool = await asyncpg.create_pool(
+                    asyncpg_dsn(config['SQLALCHEMY_DATABASE_URI']),
+                    min_size=1,
+                    max_size=config['DB_POOL_SIZE'] + config['DB_MAX_OVERFLOW'],
+                    max_inactive_connection_lifetime=config['DB_POOL_RECYCLE'],
+                    server_settings=server_settings,
+                    init=init_connection,
+                )
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                if self.pool is not None:
+                    await self.pool.close()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    def _match(self, path):
+        # Resolve through Flask's own URL map so routing (static segments
+        # before <id>, trailing-slash redirects) is identical to the sync app.
+        try:
+            endpoint, values = self.url_adapter.match(path, method='GET')
+        except HTTPException:
+            return None
+        entity = self.routes.get(endpoint)
+        if entity is None:
+            return None
+        return entity, values.get('id')
+
+    @staticmethod
+    def _header(scope, name):
+        for key, value in scope['headers']:
+            if key == name:
+                return value.decode('latin-1')
+        return ''
+
+    def _passthrough(self, scope):
+        # Streamed exports and ?expand= joins are served by the Flask routes.
+        args = dict(parse_qsl(scope['query_string'].decode('latin-1')))
+        if 'expand' in args:
+            return True
+        return args.get('stream') in ('1', 'true') or NDJSON_MIMETYPE in self._header(scope, b'accept')
+
+    def _compile(self, sql):
+        compiled = self._compiled.get(sql.text)
+        if compiled is None:
+            result = sql.compile(dialect=DIALECT)
+            compiled = self._compiled[sql.text] = (result.string, result.positiontup)
+        return compiled
+
+    async def _fetch(self, sql, params):
+        statement, names = self._compile(sql)
+        async with self.pool.acquire() as conn:
+            return await conn.fetch(statement, *[params[name] for name in names])
+
+    async def _handle(self, scope, send, entity, id):
+        args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1')))
+        if id is None:
+            try:
+                sql, params, order_by, limit = build_list_query(
+                    entity.table, entity.filters, entity.sortable, args,
+                    time_column=entity.time_column, columns=entity.all_columns
+                )
+            except InvalidQuery as e:
+                return await self._respond(scope, send, 400, {"error": str(e)})
+            rows = [dict(r) for r in await self._fetch(sql, params)]
+            next_cursor = None
+            if len(rows) > limit:
+                rows = rows[:limit]
+                next_cursor = encode_cursor(rows[-1][order_by], rows[-1]['id'])
+            return await self._respond(scope, send, 200, {"items": rows, "next_cursor": next_cursor})
+
+        try:
+            fields = parse_fields(args, entity.all_columns)
+        except InvalidQuery as e:
+            return await self._respond(scope, send, 400, {"error": str(e)})
+        try:
+            rows = await self._fetch(entity.select_one(fields), {'id': id})
+        except asyncpg.DataError:
+            rows = []
+        if not rows:
+            return await self._respond(scope, send, 404, {"error": f"{entity.label} not found"})
+        return await self._respond(scope, send, 200, dict(rows[0]))
+
+    async def _respond(self, scope, send, status, payload):
+        body = (self.flask_app.json.dumps(payload) + '\n').encode()
+        headers = [(b'content-type', b'application/json')]
+        if status == 200:
+            # Same weak ETag / 304 behaviour as conditional.etag_response.
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers.append((b'etag', etag.encode()))
+            if etag in self._header(scope, b'if-none-match'):
+                status, body = 304, b''
+        headers.append((b'content-length', str(len(body)).encode()))
+        request_headers = Headers([(k.decode('latin-1'), v.decode('latin-1')) for k, v in scope['headers']])
+        for name, value in get_cors_headers(self.cors_options, request_headers, 'GET').items(multi=True):
+            headers.append((name.lower().encode(), str(value).encode()))
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        await send({'type': 'http.response.body', 'body': body})
+
+
+app = AsyncReadApp(create_app())
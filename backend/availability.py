@@ -0,0 +1,123 @@
+# backend/availability.py
+from datetime import datetime, timedelta
+
+from flask import current_app
+from sqlalchemy import text
+from extensions import db
+from pagination import InvalidQuery, parse_timestamp
+
+DEFAULT_DURATION = 30
+MAX_DURATION = 480
+MAX_WINDOW_DAYS = 31
+MAX_DOCTORS = 500
+
+# Must match migrations/0007_appointment_slots.sql
+# for the GiST indexes to apply. Status is free text ("Cancelled" from the frontend).
+APPOINTMENT_SLOT = "tsrange(scheduled_at, scheduled_at + duration_minutes * interval '1 minute')"
+APPOINTMENT_ACTIVE = "scheduled_at IS NOT NULL AND lower(status) IS DISTINCT FROM 'cancelled'"
+SESSION_SLOT = (
+    "tsrange(started_at, GREATEST(started_at, COALESCE(ended_at, started_at + interval '30 minutes')))"
+)
+
+# Free time per doctor = clinic hours in the window minus booked appointments
+# and recorded sessions, computed with multiranges in one statement. One row
+# per doctor with its windows as a JSON array of [start, end] pairs (null when
+# fully booked), which keeps a 500-doctor week to 500 rows for the driver.
+AVAILABILITY_SQL = text(f"""
+    WITH window_range AS (
+        SELECT tsrange(CAST(:since AS timestamp), CAST(:until AS timestamp)) AS w
+    ),
+    doctors AS (
+        SELECT id AS doctor_id FROM humatrace.doctors
+        WHERE (CAST(:ids AS uuid[]) IS NULL OR id = ANY(CAST(:ids AS uuid[])))
+          AND (CAST(:specialty AS text) IS NULL OR specialty = :specialty)
+        ORDER BY id
+        LIMIT :max_doctors
+    ),
+    working AS (
+        -- Clinic days and hours are local time; stored timestamps are UTC.
+        SELECT COALESCE(range_agg(tsrange(
+                   (d + CAST(:day_start AS time)) AT TIME ZONE :tz AT TIME ZONE 'UTC',
+                   (d + CAST(:day_end AS time)) AT TIME ZONE :tz AT TIME ZONE 'UTC'
+               )), '{{}}') * tsmultirange((SELECT w FROM window_range)) AS hours
+        FROM generate_series(CAST(CAST(:since AS date) - 1 AS timestamp),
+                             CAST(CAST(:until AS date) + 1 AS timestamp), interval '1 day') AS d
+        WHERE extract(isodow FROM d) = ANY(CAST(:days AS integer[]))
+    ),
+    busy AS (
+        SELECT doctor_id, range_agg(slot) AS slots FROM (
+            SELECT doctor_id, {APPOINTMENT_SLOT} AS slot
+            FROM humatrace.appointments
+            WHERE doctor_id IN (SELECT doctor_id FROM doctors) AND doctor_id IS NOT NULL
+              AND {APPOINTMENT_ACTIVE}
+              AND {APPOINTMENT_SLOT} && (SELECT w FROM window_range)
+            UNION ALL
+            SELECT doctor_id, {SESSION_SLOT}
+            FROM humatrace.sessions
+            WHERE doctor_id IN (SELECT doctor_id FROM doctors) AND doctor_id IS NOT NULL
+              AND started_at IS NOT NULL
+              AND {SESSION_SLOT} && (SELECT w FROM window_range)
+        ) b
+        GROUP BY doctor_id
+    )
+    SELECT d.doctor_id, (
+        SELECT json_agg(json_build_array(lower(free), upper(free)))
+        FROM unnest(working.hours - COALESCE(busy.slots, '{{}}')) AS free
+        WHERE upper(free) - lower(free) >= :duration * interval '1 minute'
+    ) AS free
+    FROM doctors d
+    CROSS JOIN working
+    LEFT JOIN busy ON busy.doctor_id = d.doctor_id
+    ORDER BY d.doctor_id
+""")
+
+
+def parse_window(args):
+    since = parse_timestamp(args.get('from'), 'from') or datetime.utcnow().replace(second=0, microsecond=0)
+    until = parse_timestamp(args.get('to'), 'to') or since + timedelta(days=7)
+    if until <= since:
+        raise InvalidQuery("to must be after from")
+    if until - since > timedelta(days=MAX_WINDOW_DAYS):
+        raise InvalidQuery(f"The window is limited to {MAX_WINDOW_DAYS} days")
+    try:
+        duration = int(args.get('duration', DEFAULT_DURATION))
+    except ValueError:
+        raise InvalidQuery("duration must be an integer number of minutes")
+    if not 1 <= duration <= MAX_DURATION:
+        raise InvalidQuery(f"duration must be between 1 and {MAX_DURATION} minutes")
+    return since, until, duration
+
+
+def free_windows(since, until, duration, ids=None, specialty=None):
+    # {doctor_id: [[start, end], ...]} for every matching doctor, as ISO
+    # strings ordered by start.
+    config = current_app.config
+    day_start, day_end = config['CLINIC_HOURS'].split('-')
+    rows = db.session.execute(AVAILABILITY_SQL, {
+        'since': since,
+        'until': until,
+        'duration': duration,
+        'ids': ids,
+        'specialty': specialty,
+        'max_doctors': MAX_DOCTORS,
+        'day_start': day_start,
+        'day_end': day_end,
+        'days': [int(day) for day in config['CLINIC_DAYS'].split(',')],
+        'tz': config['CLINIC_TIMEZONE'],
+    })
+    return {str(row.doctor_id): row.free or [] for row in rows}
+
+
+def slot_starts(windows, duration, step):
+    # Start times on the step grid (minutes from midnight) where a visit of
+    # `duration` minutes fits entirely inside a free window.
+    starts = []
+    length, step = timedelta(minutes=duration), timedelta(minutes=step)
+    for start, end in windows:
+        start, end = datetime.fromisoformat(start), datetime.fromisoformat(end)
+        midnight = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        slot = midnight + -(-(start - midnight) // step) * step
+        while slot + length <= end:
+            starts.append(slot)
+            slot += step
+    return starts
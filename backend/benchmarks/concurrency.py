@@ -0,0 +1,104 @@
+# backend/benchmarks/concurrency.py
+#
+# Keep-alive HTTP load generator for comparing the sync (flask/WSGI) and
+# async (uvicorn asgi:app) servers on the same polling workload. Start both
+# servers against the same database, then from backend/:
+#   python -m benchmarks.concurrency --url http://127.0.0.1:5000 \
+#       --url http://127.0.0.1:8000 --path /patient/ --concurrency 500
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+
+async def request_once(reader, writer, request):
+    # Returns (status, keep_alive) after reading one full response.
+    writer.write(request)
+    status = int((await reader.readline()).split()[1])
+    length, keep_alive = 0, True
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        name = name.lower()
+        if name == 'content-length':
+            length = int(value)
+        elif name == 'connection' and value.strip().lower() == 'close':
+            keep_alive = False
+    await reader.readexactly(length)
+    return status, keep_alive
+
+
+async def worker(host, port, path, deadline, timeout, latencies, errors):
+    # Reuses its connection while the server allows keep-alive (uvicorn does,
+    # the Flask dev server does not) and reconnects otherwise.
+    request = (f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+               f"Accept: application/json\r\n\r\n").encode()
+    writer = None
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            status, keep_alive = await asyncio.wait_for(request_once(reader, writer, request), timeout)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, IndexError, ValueError):
+            errors.append('connection')
+            status, keep_alive = None, False
+        else:
+            latencies.append(time.perf_counter() - started)
+            if status >= 400:
+                errors.append(status)
+        if not keep_alive and writer is not None:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(len(values) * fraction))] * 1000, 2)
+
+
+async def run(url, path, concurrency, duration, timeout):
+    parts = urlsplit(url)
+    latencies, errors = [], []
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        worker(parts.hostname, parts.port or 80, path, deadline, timeout, latencies, errors)
+        for _ in range(concurrency)
+    ), return_exceptions=True)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        'url': url,
+        'path': path,
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'errors': len(errors),
+        'throughput_rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': percentile(latencies, 0.50),
+        'p95_ms': percentile(latencies, 0.95),
+        'p99_ms': percentile(latencies, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', action='append', required=True,
+                        help='Server base URL; repeat to compare servers.')
+    parser.add_argument('--path', default='/patient/')
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=10.0, help='Seconds per server.')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds.')
+    args = parser.parse_args()
+    for url in args.url:
+        print(json.dumps(asyncio.run(run(url, args.path, args.concurrency, args.duration, args.timeout))))
+
+
+if __name__ == '__main__':
+    main()
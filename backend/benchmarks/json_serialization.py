@@ -0,0 +1,63 @@
+# backend/benchmarks/json_serialization.py
+#
+# Compares Flask's stock JSON provider (with the dict(row) copy the
+# handlers used to make) against HumaTraceJSONProvider on a list of
+# patient_vitals-shaped rows. Run from backend/:
+#   python -m benchmarks.json_serialization [rows]
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine.result import IteratorResult, SimpleResultMetaData
+
+import json_provider
+from json_provider import HumaTraceJSONProvider
+
+
+def build_rows(count):
+    # Real SQLAlchemy Row objects, typed the way psycopg2 returns them.
+    keys = ['id', 'patient_id', 'height_cm', 'weight_kg', 'blood_pressure',
+            'temperature_celsius', 'recorded_at']
+    start = datetime(2024, 1, 1)
+    data = (
+        (uuid.uuid4(), uuid.uuid4(), Decimal('172.5'), Decimal('70.25'), '120/80',
+         Decimal('36.6'), start + timedelta(minutes=i))
+        for i in range(count)
+    )
+    return IteratorResult(SimpleResultMetaData(keys), data).all()
+
+
+def timed(label, fn, repeat=3):
+    best = min(_run(fn) for _ in range(repeat))
+    print(f"{label:<40} {best * 1000:8.1f} ms")
+    return best
+
+
+def _run(fn):
+    started = time.perf_counter()
+    fn()
+    return time.perf_counter() - started
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    rows = build_rows(count)
+    print(f"{count} rows, orjson {'available' if json_provider.orjson else 'missing'}")
+
+    app = Flask(__name__)
+    stock = DefaultJSONProvider(app)
+    fast = HumaTraceJSONProvider(app)
+    with app.app_context():
+        baseline = timed("stock provider, dict(row._mapping)",
+                         lambda: stock.response([dict(r._mapping) for r in rows]))
+        fast_time = timed("HumaTraceJSONProvider, Row objects",
+                          lambda: fast.response(rows))
+    print(f"speedup: {baseline / fast_time:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
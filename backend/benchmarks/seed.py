@@ -0,0 +1,234 @@
+# backend/benchmarks/seed.py
+#
+# Fills a disposable database with reproducible synthetic data across all 13
+# humatrace tables, for benchmarks.suite. Rows are generated server-side with
+# INSERT ... SELECT FROM generate_series, so 10M rows never cross the wire.
+# From backend/, against the database in DATABASE_URL:
+#   python -m benchmarks.seed --rows 1000000 --reset
+#
+# Ids are md5(table:n) UUIDs and every batch reseeds random(), so the same
+# --rows/--seed/--start always produce the same data and the suite can pick
+# ids without looking them up.
+import argparse
+import json
+import sys
+import time
+from datetime import date
+
+from sqlalchemy import text
+
+import migrate
+import partitions
+from app import create_app
+from extensions import db
+
+BATCH_ROWS = 100_000
+
+FIRST_NAMES = ('Amina', 'Ben', 'Chen', 'Dara', 'Elif', 'Femi', 'Grace', 'Hugo', 'Ines', 'Jonas',
+               'Kemi', 'Lars', 'Maya', 'Nikhil', 'Olga', 'Pedro', 'Qin', 'Rosa', 'Sami', 'Tariq')
+LAST_NAMES = ('Adeyemi', 'Brown', 'Costa', 'Dubois', 'Eriksen', 'Fischer', 'Garcia', 'Haddad',
+              'Ivanova', 'Jensen', 'Kowalski', 'Lopez', 'Mensah', 'Nakamura', 'Okafor', 'Patel')
+SPECIALTIES = ('cardiology', 'dermatology', 'general practice', 'neurology', 'oncology',
+               'paediatrics', 'psychiatry', 'radiology')
+MEDICATION_TYPES = ('tablet', 'capsule', 'syrup', 'injection', 'inhaler', 'cream')
+TEST_TYPES = ('blood', 'urine', 'imaging', 'genetic', 'allergy')
+
+# (table, share of --rows, minimum). Parents come first; test_results takes
+# whatever is left so the total matches --rows.
+PLAN = (
+    ('patients', 0.08, 100),
+    ('doctors', 0.002, 10),
+    ('issues', 0.0005, 20),
+    ('medications', 0.001, 50),
+    ('tests', 0.0005, 20),
+    ('birth_records', 0.04, 0),
+    ('appointments', 0.12, 0),
+    ('diagnoses', 0.08, 0),
+    ('treatments', 0.06, 0),
+    ('medication_history', 0.08, 0),
+    ('patient_vitals', 0.30, 0),
+    ('sessions', 0.08, 0),
+    ('test_results', None, 0),
+)
+
+
+def row_id(table, n='n'):
+    return f"md5('{table}:' || {n})::uuid"
+
+
+def ref(table):
+    # A uniformly random existing row of a parent table.
+    return row_id(table, f"(1 + floor(random() * :{table}))::bigint")
+
+
+def pick(values):
+    quoted = ', '.join("'" + v.replace("'", "''") + "'" for v in values)
+    return f"(ARRAY[{quoted}])[1 + floor(random() * {len(values)})::int]"
+
+
+def within_span():
+    return "date_trunc('minute', CAST(:start AS timestamp) + random() * (CAST(:end AS timestamp) - CAST(:start AS timestamp)))"
+
+
+# Appointments are laid out on a per-doctor grid of 30-minute slots, eight
+# hours a day: the k-th appointment of a doctor goes to day k (offset per
+# doctor) and moves one slot later each time the days wrap around. That
+# spreads them over the span and never trips appointments_no_overlap.
+APPOINTMENT_K = "((n - 1) / :doctors)"
+APPOINTMENT_DOCTOR = "((n - 1) % :doctors)"
+
+GENERATORS = {
+    'patients': (
+        "first_name, last_name, gender, phone, date_of_birth",
+        f"{pick(FIRST_NAMES)}, {pick(LAST_NAMES)}, {pick(('female', 'male', 'other'))}, "
+        "'+1555' || lpad((n % 10000000)::text, 7, '0'), "
+        "DATE '1930-01-01' + floor(random() * 32000)::int"
+    ),
+    'doctors': (
+        "first_name, last_name, specialty, phone, email",
+        f"{pick(FIRST_NAMES)}, {pick(LAST_NAMES)}, {pick(SPECIALTIES)}, "
+        "'+1444' || lpad(n::text, 7, '0'), 'doctor' || n || '@humatrace.test'"
+    ),
+    'issues': (
+        "name, severity, created_at",
+        f"'Issue ' || n, {pick(('low', 'medium', 'high', 'critical'))}, {within_span()}"
+    ),
+    'medications': (
+        "name, type, description, side_effects",
+        f"'Medication ' || n, {pick(MEDICATION_TYPES)}, 'Synthetic medication ' || n, "
+        f"{pick(('nausea', 'headache', 'drowsiness', 'dizziness', 'none known'))}"
+    ),
+    'tests': (
+        "name, type, description",
+        f"'Test ' || n, {pick(TEST_TYPES)}, 'Synthetic test ' || n"
+    ),
+    'birth_records': (
+        "patient_id, date_of_birth, place_of_birth, delivery_method, birth_weight",
+        f"{row_id('patients')}, DATE '1930-01-01' + floor(random() * 32000)::int, "
+        f"{pick(('Lagos', 'Lisbon', 'Oslo', 'Osaka', 'Toronto'))}, "
+        f"{pick(('vaginal', 'caesarean', 'assisted'))}, round((2.0 + random() * 2.5)::numeric, 2)"
+    ),
+    'appointments': (
+        "patient_id, doctor_id, scheduled_at, status, duration_minutes",
+        f"{ref('patients')}, {row_id('doctors', f'(1 + {APPOINTMENT_DOCTOR})')}, "
+        f"CAST(:start AS timestamp) + (({APPOINTMENT_K} + {APPOINTMENT_DOCTOR} * 37) % :span_days) * interval '1 day' "
+        f"+ interval '9 hours' + (({APPOINTMENT_K} / :span_days + {APPOINTMENT_DOCTOR}) % 16) * interval '30 minutes', "
+        f"{pick(('Scheduled', 'Scheduled', 'Completed', 'Cancelled'))}, 30"
+    ),
+    'diagnoses': (
+        "patient_id, issue_id, description, diagnosed_at",
+        f"{ref('patients')}, {ref('issues')}, 'Synthetic diagnosis ' || n, {within_span()}"
+    ),
+    'treatments': (
+        "patient_id, diagnosis_id, treatment_plan, started_at, ended_at",
+        f"{ref('patients')}, {ref('diagnoses')}, 'Plan ' || n, s, s + floor(random() * 90) * interval '1 day'"
+    ),
+    'medication_history': (
+        "patient_id, medication_id, dosage, start_date, end_date, notes",
+        f"{ref('patients')}, {ref('medications')}, {pick(('5 mg', '10 mg', '20 mg', '50 mg'))}, "
+        "CAST(s AS date), CAST(s AS date) + floor(random() * 60)::int, NULL"
+    ),
+    'patient_vitals': (
+        "patient_id, height_cm, weight_kg, blood_pressure, temperature_celsius, recorded_at",
+        f"{ref('patients')}, round((150 + random() * 45)::numeric, 1), round((45 + random() * 70)::numeric, 1), "
+        "(100 + floor(random() * 50)) || '/' || (60 + floor(random() * 30)), "
+        f"round((36 + random() * 2.5)::numeric, 1), {within_span()}"
+    ),
+    'sessions': (
+        "patient_id, doctor_id, started_at, ended_at, notes",
+        f"{ref('patients')}, {ref('doctors')}, s, s + floor(10 + random() * 50) * interval '1 minute', NULL"
+    ),
+    'test_results': (
+        "test_id, patient_id, result, taken_at",
+        f"{ref('tests')}, {ref('patients')}, {pick(('normal', 'abnormal', 'inconclusive'))}, {within_span()}"
+    ),
+}
+
+
+def plan_counts(rows):
+    counts, remaining = {}, rows
+    for table, share, minimum in PLAN:
+        count = remaining if share is None else max(minimum, int(rows * share))
+        counts[table] = max(0, min(count, remaining))
+        remaining -= counts[table]
+    return counts
+
+
+def insert_sql(table):
+    columns, values = GENERATORS[table]
+    # s is a random timestamp in the span, shared by the start/end columns.
+    return text(
+        f"INSERT INTO humatrace.{table} (id, {columns}) "
+        f"SELECT {row_id(table)}, {values} "
+        f"FROM (SELECT n, {within_span()} AS s FROM generate_series(:low, :high) AS n) AS g"
+    )
+
+
+def set_change_capture(conn, enabled):
+    # Seeding is not a change anyone subscribed to; skip the change_log
+    # triggers but keep the vitals rollup ones.
+    action = 'ENABLE' if enabled else 'DISABLE'
+    for table, *_ in PLAN:
+        for op in ('insert', 'update', 'delete'):
+            conn.execute(text(f"ALTER TABLE humatrace.{table} {action} TRIGGER {table}_changes_{op}"))
+
+
+def seed(engine, rows, seed_value, start, end):
+    counts = plan_counts(rows)
+    params = dict(counts, start=start, end=end, span_days=(end - start).days)
+    months = (end.year - start.year) * 12 + end.month - start.month
+    partitions.ensure_partitions(engine, months_ahead=months, today=start)
+    timings = {}
+    with engine.begin() as conn:
+        set_change_capture(conn, False)
+    try:
+        for index, (table, *_) in enumerate(PLAN):
+            started = time.perf_counter()
+            sql = insert_sql(table)
+            batch = BATCH_ROWS
+            for low in range(1, counts[table] + 1, batch):
+                high = min(low + batch - 1, counts[table])
+                with engine.begin() as conn:
+                    # One seed per (table, batch) keeps runs reproducible
+                    # regardless of batch commit timing.
+                    conn.execute(text("SELECT setseed(:value)"),
+                                 {'value': ((seed_value * 7919 + index * 104729 + low) % 1999993) / 1999993})
+                    conn.execute(sql, dict(params, low=low, high=high))
+            timings[table] = round(time.perf_counter() - started, 2)
+            print(f"{table:<20} {counts[table]:>10} rows {timings[table]:>8}s", file=sys.stderr)
+    finally:
+        with engine.begin() as conn:
+            set_change_capture(conn, True)
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+        conn.execute(text("ANALYZE"))
+    return {'rows': rows, 'seed': seed_value, 'start': start.isoformat(), 'end': end.isoformat(),
+            'tables': counts, 'seconds': timings}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10_000, help='Total rows across all tables.')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--start', type=date.fromisoformat, default=date(2025, 1, 1),
+                        help='First day of the generated time span.')
+    parser.add_argument('--end', type=date.fromisoformat, default=date(2026, 1, 1))
+    parser.add_argument('--reset', action='store_true',
+                        help='Drop the humatrace schema and re-run the migrations first.')
+    args = parser.parse_args()
+    if args.end <= args.start:
+        parser.error('--end must be after --start')
+
+    app = create_app()
+    with app.app_context():
+        if args.reset:
+            with db.engine.begin() as conn:
+                conn.execute(text("DROP SCHEMA IF EXISTS humatrace CASCADE"))
+        migrate.upgrade(db.engine)
+        with db.engine.connect() as conn:
+            if conn.execute(text("SELECT EXISTS (SELECT 1 FROM humatrace.patients)")).scalar():
+                parser.error('humatrace.patients is not empty; seed a disposable database with --reset')
+        print(json.dumps(seed(db.engine, args.rows, args.seed, args.start, args.end)))
+
+
+if __name__ == '__main__':
+    main()
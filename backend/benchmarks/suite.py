@@ -0,0 +1,215 @@
+# backend/benchmarks/suite.py
+#
+# Drives every endpoint in turn with the keep-alive load generator from
+# benchmarks.concurrency and reports p50/p95/p99 latency, throughput and the
+# server's resident memory per endpoint as one JSON document. Seed a database
+# with benchmarks.seed, start a server on it, then from backend/:
+#   python -m benchmarks.suite --url http://127.0.0.1:8000 --pid <server pid> \
+#       --output before.json
+#   python -m benchmarks.suite ... --output after.json --baseline before.json
+# --server "gunicorn -c gunicorn.conf.py wsgi:app" starts (and stops) the
+# server itself. RSS covers the process and all its children (gunicorn
+# workers) and is read from /proc, so it is only reported on Linux.
+import argparse
+import asyncio
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime, timezone
+from urllib.parse import urlencode
+
+from benchmarks.concurrency import run
+
+ENTITIES = ('patient', 'doctor', 'issue', 'medication', 'test', 'appointment', 'birth_record',
+            'diagnosis', 'medication_history', 'patient_vitals', 'session', 'test_result',
+            'treatment')
+LIST_LIMIT = 50
+BATCH_IDS = 50
+RSS_SAMPLE_SECONDS = 0.2
+READY_TIMEOUT = 60
+
+
+def get_json(url):
+    with urllib.request.urlopen(url, timeout=30) as response:
+        return json.load(response)
+
+
+def discover_paths(url, only=None):
+    # (name, path) pairs. Ids come from the first page of each list so the
+    # suite works on any populated database, seeded or not.
+    pages = {name: get_json(f"{url}/{name}/?limit={LIST_LIMIT}")['items'] for name in ENTITIES}
+    paths = []
+    for name in ENTITIES:
+        paths.append((f"{name}.list", f"/{name}/?limit={LIST_LIMIT}"))
+        if pages[name]:
+            paths.append((f"{name}.get", f"/{name}/{pages[name][0]['id']}"))
+
+    patient_ids = [row['id'] for row in pages['patient'][:BATCH_IDS]]
+    vitals = pages['patient_vitals']
+    appointments = pages['appointment']
+    if patient_ids:
+        paths.append(('patient.batch_get', f"/patient/batch_get?ids={','.join(patient_ids)}"))
+        paths.append(('patient.search', f"/patient/search?{urlencode({'q': pages['patient'][0]['last_name'] or 'an'})}"))
+    if vitals:
+        patient_id = vitals[0]['patient_id']
+        paths.append(('patient.timeline', f"/patient/{patient_id}/timeline"))
+        paths.append(('patient_vitals.series', f"/patient_vitals/series?patient_id={patient_id}&bucket=1d"))
+    paths.append(('doctor.search', "/doctor/search?q=cardio"))
+    paths.append(('medication.search', "/medication/search?q=medication"))
+    paths.append(('appointment.expand', f"/appointment/?limit={LIST_LIMIT}&expand=patient,doctor"))
+    if appointments and appointments[0]['scheduled_at']:
+        since = appointments[0]['scheduled_at'][:10]
+        window = urlencode({'from': f"{since}T00:00:00"})
+        paths.append(('doctor.availability', f"/doctor/{appointments[0]['doctor_id']}/availability?{window}"))
+        paths.append(('doctor.availability_all', f"/doctor/availability?{window}"))
+    paths.append(('changes', "/changes?since=0&limit=100"))
+    paths.append(('stats.dashboard', "/stats/dashboard"))
+    paths.append(('health.db', "/health/db"))
+    if only:
+        paths = [(name, path) for name, path in paths if name in only]
+    return paths
+
+
+def process_tree(pid):
+    pids, pending = [], [pid]
+    while pending:
+        current = pending.pop()
+        pids.append(current)
+        try:
+            for task in os.listdir(f"/proc/{current}/task"):
+                with open(f"/proc/{current}/task/{task}/children") as children:
+                    pending.extend(int(child) for child in children.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def rss_mb(pid):
+    if pid is None:
+        return None
+    total = 0
+    for member in process_tree(pid):
+        try:
+            with open(f"/proc/{member}/status") as status:
+                for line in status:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total / 1024, 1) if total else None
+
+
+async def measure(url, name, path, args, pid):
+    # Runs one endpoint while sampling RSS alongside it.
+    samples = []
+
+    async def sample():
+        while True:
+            samples.append(rss_mb(pid))
+            await asyncio.sleep(RSS_SAMPLE_SECONDS)
+
+    sampler = asyncio.create_task(sample())
+    try:
+        result = await run(url, path, args.concurrency, args.duration, args.timeout)
+    finally:
+        sampler.cancel()
+    samples = [s for s in samples if s is not None]
+    result.update(name=name, rss_mb_max=max(samples, default=None), rss_mb_after=rss_mb(pid))
+    del result['url']
+    return result
+
+
+def compare(results, baseline):
+    # Percent change against a previous run, per endpoint present in both.
+    previous = {r['name']: r for r in baseline['endpoints']}
+    for result in results:
+        old = previous.get(result['name'])
+        if old is None:
+            continue
+        result['delta_pct'] = {
+            key: round((result[key] - old[key]) / old[key] * 100, 1)
+            for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps', 'rss_mb_max')
+            if result.get(key) is not None and old.get(key)
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def start_server(command, url):
+    server = subprocess.Popen(shlex.split(command), start_new_session=True)
+    deadline = time.monotonic() + READY_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            sys.exit(f"server exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"{url}/health/ready", timeout=2) as response:
+                if response.status == 200:
+                    return server
+        except OSError:
+            pass
+        time.sleep(0.5)
+    os.killpg(server.pid, signal.SIGTERM)
+    sys.exit(f"server not ready after {READY_TIMEOUT}s")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url', default='http://127.0.0.1:5000')
+    parser.add_argument('--pid', type=int, help='Server process to report RSS for.')
+    parser.add_argument('--server', help='Command that starts the server; implies --pid.')
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=5.0, help='Seconds per endpoint.')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds.')
+    parser.add_argument('--only', help='Comma-separated endpoint names, e.g. patient.list,doctor.search')
+    parser.add_argument('--output', help='Also write the report to this file.')
+    parser.add_argument('--baseline', help='Earlier report to compute delta_pct against.')
+    args = parser.parse_args()
+    url = args.url.rstrip('/')
+
+    server = start_server(args.server, url) if args.server else None
+    pid = server.pid if server else args.pid
+    try:
+        only = set(args.only.split(',')) if args.only else None
+        results = []
+        for name, path in discover_paths(url, only):
+            result = asyncio.run(measure(url, name, path, args, pid))
+            print(f"{name:<28} {result['throughput_rps']:>9} rps  p50 {result['p50_ms']} ms  "
+                  f"p99 {result['p99_ms']} ms  errors {result['errors']}", file=sys.stderr)
+            results.append(result)
+    finally:
+        if server is not None:
+            os.killpg(server.pid, signal.SIGTERM)
+            server.wait()
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            compare(results, json.load(f))
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'url': url,
+        'server': args.server,
+        'concurrency': args.concurrency,
+        'duration': args.duration,
+        'endpoints': results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
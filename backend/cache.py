@@ -0,0 +1,166 @@
+# backend/cache.py
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from flask import make_response, request
+
+
+class MemoryBackend:
+    # In-process LRU with per-entry TTL. Invalidation only reaches the
+    # current process; use RedisBackend when running several workers.
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def generation(self, namespace):
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def bump_generation(self, namespace):
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    # Works with any client exposing the redis-py get/set/delete/incr API,
+    # so a local stand-in (e.g. fakeredis) can replace a real server.
+
+    def __init__(self, client, prefix='humatrace:'):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def generation(self, namespace):
+        return int(self.client.get(f"{self.prefix}gen:{namespace}") or 0)
+
+    def bump_generation(self, namespace):
+        self.client.incr(f"{self.prefix}gen:{namespace}")
+
+
+def row_key(table, id):
+    # Ids reach here from URLs in any case and with or without hyphens.
+    return f"{table}:row:{uuid.UUID(id)}"
+
+
+class Cache:
+    # Read-through cache for serialized GET responses. Row entries are
+    # deleted by id on writes; list entries are keyed by a per-table
+    # generation that every write bumps, so old pages are never read again.
+
+    def __init__(self):
+        self.backend = None
+        self.ttl = 60
+        self.stats = {}
+
+    def init_app(self, app, backend=None):
+        self.ttl = app.config.get('CACHE_TTL', 60)
+        if backend is None:
+            backend = self._backend_from_config(app.config)
+        self.backend = backend
+        app.extensions['humatrace_cache'] = self
+
+    def _backend_from_config(self, config):
+        kind = config.get('CACHE_BACKEND', 'memory')
+        if kind == 'none':
+            return None
+        if kind == 'redis':
+            try:
+                import redis
+            except ImportError:
+                raise RuntimeError("CACHE_BACKEND=redis requires the 'redis' package")
+            return RedisBackend(redis.Redis.from_url(config['CACHE_REDIS_URL']))
+        return MemoryBackend(config.get('CACHE_MAX_ENTRIES', 1024))
+
+    def _count(self, table, outcome):
+        counters = self.stats.setdefault(table, {'hits': 0, 'misses': 0})
+        counters[outcome] += 1
+
+    def _serve(self, table, key, produce, generation=None):
+        body = self.backend.get(key)
+        if body is not None:
+            self._count(table, 'hits')
+            response = make_response(body)
+            response.mimetype = 'application/json'
+            return response
+        self._count(table, 'misses')
+        response = make_response(produce())
+        if response.status_code == 200:
+            self.backend.set(key, response.get_data(), self.ttl)
+            # A write that committed after generation was read may have been
+            # invalidated before this store, leaving the pre-write row cached;
+            # its bump is visible by now, so take the entry back out.
+            if generation is not None and self.backend.generation(table) != generation:
+                self.backend.delete(key)
+        return response
+
+    def cached_list(self, table, produce):
+        if self.backend is None:
+            return produce()
+        query = '&'.join(f"{k}={v}" for k, v in sorted(request.args.items(multi=True)))
+        key = f"{table}:list:{self.backend.generation(table)}:{query}"
+        return self._serve(table, key, produce)
+
+    def cached_row(self, table, id, produce, fields=None):
+        if self.backend is None:
+            return produce()
+        # Read before produce() runs, so a write landing in between is seen.
+        generation = self.backend.generation(table)
+        if fields is not None:
+            # Sparse variants are keyed by the table generation like list
+            # entries, since invalidate() only deletes the full-row key.
+            key = f"{row_key(table, id)}:{generation}:{','.join(fields)}"
+            return self._serve(table, key, produce)
+        return self._serve(table, row_key(table, id), produce, generation)
+
+    def invalidate(self, table, id=None):
+        if self.backend is None:
+            return
+        self.backend.bump_generation(table)
+        if id is not None:
+            self.backend.delete(row_key(table, id))
+
+    def summary(self):
+        hits = sum(c['hits'] for c in self.stats.values())
+        misses = sum(c['misses'] for c in self.stats.values())
+        return {
+            'backend': type(self.backend).__name__ if self.backend else None,
+            'hits': hits,
+            'misses': misses,
+            'tables': self.stats,
+        }
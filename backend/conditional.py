@@ -0,0 +1,14 @@
+# backend/conditional.py
+import hashlib
+
+from flask import request
+
+
+def etag_response(response):
+    # Weak ETag over the serialized body. A matching If-None-Match turns the
+    # response into a bodyless 304, so polling clients only download changes.
+    if request.method != 'GET' or response.status_code != 200 or response.is_streamed:
+        return response
+    digest = hashlib.blake2b(response.get_data(), digest_size=16).hexdigest()
+    response.set_etag(digest, weak=True)
+    return response.make_conditional(request)
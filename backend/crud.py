@@ -0,0 +1,378 @@
+# backend/crud.py
+import functools
+import json
+import uuid
+
+from flask import Blueprint, request, jsonify
+from sqlalchemy import column, insert, table as table_clause, text
+from sqlalchemy.exc import IntegrityError
+from extensions import db, cache
+from conditional import etag_response
+from pagination import InvalidQuery, paginated_list, parse_fields
+import expand
+import idempotency
+from streaming import NDJSON_MIMETYPE, wants_stream
+
+MAX_BULK_ITEMS = 10000
+MAX_BATCH_IDS = 1000
+# unique_violation and exclusion_violation (e.g. an overlapping appointment)
+CONFLICT_SQLSTATES = ('23505', '23P01')
+
+
+class Entity:
+    # Describes one humatrace table. All statements are built once here at
+    # import time and reused by every request.
+
+    def __init__(self, name, plural, table, label, columns,
+                 filters=(), sortable=('id',), update_columns=None,
+                 insert_defaults=None, insert_overrides=None, update_defaults=None,
+                 update_keep=(), time_column=None, cached=False, references=None):
+        self.name = name
+        self.plural = plural
+        self.table = table
+        self.label = label
+        self.columns = tuple(columns)
+        self.update_columns = tuple(update_columns or columns)
+        self.filters = tuple(filters)
+        self.sortable = tuple(sortable)
+        # Callables producing a value when the payload omits the column
+        # (insert_defaults/update_defaults) or regardless of it (insert_overrides).
+        self.insert_defaults = insert_defaults or {}
+        self.insert_overrides = insert_overrides or {}
+        self.update_defaults = update_defaults or {}
+        # Columns a PUT leaves unchanged when the payload omits them.
+        self.update_keep = tuple(update_keep)
+        self.time_column = time_column
+        # Small read-mostly catalogs serve GETs from the response cache.
+        self.cached = cached
+        # ?expand= targets: name -> (foreign key column, referenced table)
+        self.references = references or {}
+        expand.register(self)
+
+        insert_cols = ('id',) + self.columns
+        # Columns a ?fields= projection may name.
+        self.all_columns = insert_cols + ('version',)
+        self.select_one_sql = text(f"SELECT * FROM {table} WHERE id = :id")
+        self._select_fields = {}
+        # A Core insert rather than text(): only Core statements qualify for
+        # the dialect's "insertmanyvalues" batching of executemany.
+        schema, _, table_name = table.rpartition('.')
+        self.insert_sql = insert(
+            table_clause(table_name, *(column(c) for c in insert_cols), schema=schema or None)
+        )
+        # RETURNING lets UPDATE/DELETE report a missing row in the same round
+        # trip instead of a separate existence check.
+        self.update_sql = text(
+            f"UPDATE {table} SET "
+            f"{', '.join(self.update_assignment(c) for c in self.update_columns)}, "
+            f"version = version + 1 WHERE id = :id RETURNING version"
+        )
+        self._patch_sql = {}
+        self.version_sql = text(f"SELECT version FROM {table} WHERE id = :id")
+        self.delete_sql = text(f"DELETE FROM {table} WHERE id = :id RETURNING id")
+
+    def select_one(self, fields=None):
+        if fields is None:
+            return self.select_one_sql
+        return self._select_where("id = :id", fields)
+
+    def select_many(self, fields=None):
+        return self._select_where("id = ANY(CAST(:ids AS uuid[]))", fields)
+
+    def _select_where(self, condition, fields):
+        # One statement per distinct (condition, fieldset); parse_fields
+        # returns fields in table order, so the variants stay bounded.
+        key = (condition, fields)
+        sql = self._select_fields.get(key)
+        if sql is None:
+            sql = self._select_fields[key] = text(
+                f"SELECT {', '.join(fields) if fields else '*'} FROM {self.table} WHERE {condition}"
+            )
+        return sql
+
+    def patch_sql(self, columns, checked):
+        # UPDATE of only the columns a PATCH sent, so the rest keep their
+        # values. One statement per distinct (columns, version check);
+        # parse_patch_body returns columns in table order, so the variants
+        # stay bounded.
+        key = (columns, checked)
+        sql = self._patch_sql.get(key)
+        if sql is None:
+            condition = "id = :id AND version = :version" if checked else "id = :id"
+            sql = self._patch_sql[key] = text(
+                f"UPDATE {self.table} SET {', '.join(f'{c} = :{c}' for c in columns)}, "
+                f"version = version + 1 WHERE {condition} RETURNING version"
+            )
+        return sql
+
+    def update_assignment(self, column):
+        if column in self.update_keep:
+            return f"{column} = COALESCE(:{column}, {column})"
+        return f"{column} = :{column}"
+
+    def insert_params(self, data, new_id):
+        params = {'id': new_id}
+        for column in self.columns:
+            if column in self.insert_overrides:
+                params[column] = self.insert_overrides[column]()
+            elif column not in data and column in self.insert_defaults:
+                params[column] = self.insert_defaults[column]()
+            else:
+                params[column] = data.get(column)
+        return params
+
+    def update_params(self, data, id):
+        params = {'id': id}
+        for column in self.update_columns:
+            if column not in data and column in self.update_defaults:
+                params[column] = self.update_defaults[column]()
+            else:
+                params[column] = data.get(column)
+        return params
+
+    def not_found(self):
+        return jsonify({"error": f"{self.label} not found"}), 404
+
+    def by_id(self, handler):
+        # Wraps a view taking <id>: ids are uuid columns, so anything else is
+        # a 404 here rather than a DataError (500) from PostgreSQL.
+        @functools.wraps(handler)
+        def view(id, **kwargs):
+            if not is_uuid(id):
+                return self.not_found()
+            return handler(id, **kwargs)
+        return view
+
+
+def parse_bulk_body():
+    # Accepts a JSON array or an NDJSON body (one object per line).
+    if request.mimetype == NDJSON_MIMETYPE:
+        try:
+            items = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        except ValueError:
+            raise ValueError("Body must be valid NDJSON")
+    else:
+        items = request.get_json(silent=True)
+        if not isinstance(items, list):
+            raise ValueError("Body must be a JSON array")
+    if not items:
+        raise ValueError("No items supplied")
+    if len(items) > MAX_BULK_ITEMS:
+        raise ValueError(f"At most {MAX_BULK_ITEMS} items per request")
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            raise ValueError(f"Item {index} must be a JSON object")
+    return items
+
+
+def parse_patch_body(entity):
+    # A JSON object of the columns to change, plus an optional integer
+    # version the row must still be at.
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        raise ValueError("Body must be a JSON object")
+    unknown = [name for name in data if name != 'version' and name not in entity.update_columns]
+    if unknown:
+        raise ValueError(f"Cannot update: {', '.join(unknown)}")
+    version = data.get('version')
+    if 'version' in data and (not isinstance(version, int) or isinstance(version, bool)):
+        raise ValueError("version must be an integer")
+    columns = tuple(c for c in entity.update_columns if c in data)
+    if not columns:
+        raise ValueError("No columns to update")
+    return columns, data, version
+
+
+def parse_batch_ids():
+    # ids come from a JSON body {"ids": [...]} or ?ids=a,b,c
+    if request.method == 'POST':
+        body = request.get_json(silent=True)
+        ids = body.get('ids') if isinstance(body, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(i, str) for i in ids):
+            raise ValueError("Body must be a JSON object with an 'ids' array of strings")
+    else:
+        ids = [i for i in request.args.get('ids', '').split(',') if i]
+    if not ids:
+        raise ValueError("No ids supplied")
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
+
+def is_uuid(value):
+    try:
+        uuid.UUID(value)
+    except ValueError:
+        return False
+    return True
+
+
+def read_options(entity):
+    # ?fields= and ?expand= for the GET endpoints; foreign keys that are
+    # expanded stay in the projection so the join can use them.
+    fields = parse_fields(request.args, entity.all_columns)
+    tree = expand.parse_expand(request.args, entity)
+    if fields is not None and tree is not None:
+        keys = expand.expansion(entity, tree)['include']
+        fields = tuple(c for c in entity.all_columns if c in fields or c in keys)
+    return fields, tree
+
+
+def expanded(entity, tree, sql):
+    if tree is None:
+        return sql
+    return text(expand.expand_sql(entity, tree, sql.text))
+
+
+def make_blueprint(name, entity):
+    bp = Blueprint(name, __name__)
+    bp.after_request(etag_response)
+    bp.entity = entity
+
+    def list_rows():
+        try:
+            tree = expand.parse_expand(request.args, entity)
+        except InvalidQuery as e:
+            return jsonify({"error": str(e)}), 400
+
+        def produce():
+            return paginated_list(entity.table, entity.filters, entity.sortable, entity.time_column,
+                                  entity.all_columns, **expand.expansion(entity, tree))
+        if entity.cached and not wants_stream():
+            return cache.cached_list(entity.table, produce)
+        return produce()
+
+    def get_row(id):
+        try:
+            fields, tree = read_options(entity)
+        except InvalidQuery as e:
+            return jsonify({"error": str(e)}), 400
+
+        def produce():
+            sql = expanded(entity, tree, entity.select_one(fields))
+            result = db.session.execute(sql, {'id': id}).fetchone()
+            if result is None:
+                return entity.not_found()
+            return jsonify(result)
+        if entity.cached:
+            return cache.cached_row(entity.table, id, produce, fields)
+        return produce()
+
+    def batch_get_rows():
+        try:
+            ids = parse_batch_ids()
+            fields, tree = read_options(entity)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        # One query for the whole list; ids that are not UUIDs cannot match
+        # and are reported as misses without reaching the database.
+        lookup = sorted({str(uuid.UUID(i)) for i in ids if is_uuid(i)})
+        found = {}
+        if lookup:
+            sql = expanded(entity, tree, entity.select_many(fields))
+            rows = db.session.execute(sql, {'ids': lookup})
+            found = {str(row.id): row for row in rows}
+        items = [found.get(str(uuid.UUID(i)) if is_uuid(i) else i) for i in ids]
+        missing = [i for i, item in zip(ids, items) if item is None]
+        return jsonify({"items": items, "missing": missing})
+
+    def integrity_error(e):
+        # Constraint violations are the client's to fix; the transaction is
+        # already aborted. Conflicts with existing rows are 409, the rest
+        # (not-null, foreign key, check) 400.
+        db.session.rollback()
+        diag = getattr(e.orig, 'diag', None)
+        status = 409 if getattr(e.orig, 'pgcode', None) in CONFLICT_SQLSTATES else 400
+        return jsonify({"error": diag.message_primary if diag else str(e.orig),
+                        "detail": diag.message_detail if diag else None}), status
+
+    def invalidate(id=None):
+        if entity.cached:
+            cache.invalidate(entity.table, id)
+
+    def create_row():
+        replayed = idempotency.begin()
+        if replayed is not None:
+            return replayed
+        data = request.json
+        new_id = str(uuid.uuid4())
+        db.session.execute(entity.insert_sql, entity.insert_params(data, new_id))
+        response = idempotency.record(jsonify({"message": f"{entity.label} created", "id": new_id}), 201)
+        db.session.commit()
+        invalidate()
+        return response
+
+    def bulk_create_rows():
+        try:
+            items = parse_bulk_body()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        replayed = idempotency.begin()
+        if replayed is not None:
+            return replayed
+        ids = [str(uuid.uuid4()) for _ in items]
+        # A list of parameter sets runs as an executemany of the Core insert,
+        # which SQLAlchemy sends as multi-row INSERT ... VALUES pages of up to
+        # 1000 rows; everything lands in one transaction.
+        db.session.execute(entity.insert_sql, [
+            entity.insert_params(data, new_id) for data, new_id in zip(items, ids)
+        ])
+        response = idempotency.record(
+            jsonify({"message": f"{entity.label} records created", "count": len(ids), "ids": ids}), 201
+        )
+        db.session.commit()
+        invalidate()
+        return response
+
+    def update_row(id):
+        data = request.json
+        updated = db.session.execute(entity.update_sql, entity.update_params(data, id)).fetchone()
+        if updated is None:
+            db.session.rollback()
+            return entity.not_found()
+        db.session.commit()
+        invalidate(id)
+        return jsonify({"message": f"{entity.label} updated", "version": updated.version})
+
+    def patch_row(id):
+        try:
+            columns, data, version = parse_patch_body(entity)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        params = {c: data[c] for c in columns}
+        params.update(id=id, version=version)
+        updated = db.session.execute(entity.patch_sql(columns, version is not None), params).fetchone()
+        if updated is None:
+            # Only a version-checked PATCH needs the second look: missing
+            # row (404) or changed since the client read it (409).
+            current = db.session.execute(entity.version_sql, {'id': id}).fetchone() if version is not None else None
+            db.session.rollback()
+            if current is None:
+                return entity.not_found()
+            return jsonify({"error": f"{entity.label} was modified by another request",
+                            "version": current.version}), 409
+        db.session.commit()
+        invalidate(id)
+        return jsonify({"message": f"{entity.label} updated", "version": updated.version})
+
+    def delete_row(id):
+        deleted = db.session.execute(entity.delete_sql, {'id': id}).fetchone()
+        if deleted is None:
+            db.session.rollback()
+            return entity.not_found()
+        db.session.commit()
+        invalidate(id)
+        return jsonify({"message": f"{entity.label} deleted"})
+
+    # Endpoint names match the hand-written handlers this replaced
+    # (e.g. patient_bp.get_patients, patient_bp.update_patient).
+    bp.add_url_rule('/', f"get_{entity.plural}", list_rows, methods=['GET'])
+    bp.add_url_rule('/<string:id>', f"get_{entity.name}", entity.by_id(get_row), methods=['GET'])
+    bp.add_url_rule('/batch_get', f"batch_get_{entity.plural}", batch_get_rows, methods=['GET', 'POST'])
+    bp.add_url_rule('/', f"create_{entity.name}", create_row, methods=['POST'])
+    bp.add_url_rule('/bulk', f"bulk_create_{entity.plural}", bulk_create_rows, methods=['POST'])
+    bp.add_url_rule('/<string:id>', f"update_{entity.name}", entity.by_id(update_row), methods=['PUT'])
+    bp.add_url_rule('/<string:id>', f"patch_{entity.name}", entity.by_id(patch_row), methods=['PATCH'])
+    bp.add_url_rule('/<string:id>', f"delete_{entity.name}", entity.by_id(delete_row), methods=['DELETE'])
+    bp.register_error_handler(IntegrityError, integrity_error)
+    return bp
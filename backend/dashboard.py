@@ -0,0 +1,44 @@
+# backend/dashboard.py
+import threading
+
+from sqlalchemy import text
+from extensions import db
+
+REFRESH_SQL = text(
+    "SELECT humatrace.refresh_dashboard_stats(:tz, make_interval(secs => :max_age))"
+)
+SNAPSHOT_SQL = text("SELECT refreshed_at, duration_ms, data FROM humatrace.dashboard_stats WHERE id = 1")
+
+
+def refresh_stats(app, max_age=0):
+    # Recomputes the snapshot unless it is younger than max_age seconds or
+    # another worker is already at it. Returns whether this call refreshed.
+    with db.engine.begin() as conn:
+        return conn.execute(REFRESH_SQL, {
+            'tz': app.config['CLINIC_TIMEZONE'], 'max_age': max_age
+        }).scalar()
+
+
+def read_snapshot():
+    return db.session.execute(SNAPSHOT_SQL).fetchone()
+
+
+def start_refresher(app):
+    # One daemon thread per worker; the advisory lock and max_age inside the
+    # SQL function keep N workers down to one refresh per interval.
+    interval = app.config['DASHBOARD_REFRESH_SECONDS']
+    if interval <= 0 or 'dashboard_refresher' in app.extensions:
+        return
+
+    def run():
+        while not stop.wait(interval):
+            try:
+                with app.app_context():
+                    refresh_stats(app, max_age=interval / 2)
+            except Exception:
+                app.logger.exception("dashboard stats refresh failed")
+
+    stop = threading.Event()
+    thread = threading.Thread(target=run, name='dashboard-refresher', daemon=True)
+    app.extensions['dashboard_refresher'] = stop
+    thread.start()
@@ -0,0 +1,73 @@
+# backend/expand.py
+from pagination import InvalidQuery
+
+MAX_EXPAND_DEPTH = 2
+
+# Every Entity by table name; filled in by crud.Entity so references can be
+# resolved without the route modules importing each other.
+ENTITIES = {}
+
+
+def register(entity):
+    ENTITIES[entity.table] = entity
+
+
+def parse_expand(args, entity):
+    # ?expand=doctor,diagnosis.issue -> {'doctor': {}, 'diagnosis': {'issue': {}}}
+    if 'expand' not in args:
+        return None
+    tree = {}
+    for path in (p.strip() for p in args['expand'].split(',')):
+        if not path:
+            continue
+        names = path.split('.')
+        if len(names) > MAX_EXPAND_DEPTH:
+            raise InvalidQuery(f"expand is limited to {MAX_EXPAND_DEPTH} levels: '{path}'")
+        current, node = entity, tree
+        for name in names:
+            if name not in current.references:
+                raise InvalidQuery(f"Cannot expand '{path}'")
+            node = node.setdefault(name, {})
+            current = ENTITIES[current.references[name][1]]
+    return tree or None
+
+
+def _joins(entity, tree, alias, joins):
+    selects = []
+    for name, children in tree.items():
+        column, table = entity.references[name]
+        child = f"e{len(joins) + 1}"
+        joins.append(f"LEFT JOIN {table} {child} ON {child}.id = {alias}.{column}")
+        if children:
+            nested = _joins(ENTITIES[table], children, child, joins)
+            pairs = ', '.join(f"'{n}', {expr}" for n, expr in nested)
+            expr = (f"CASE WHEN {child}.id IS NULL THEN NULL "
+                    f"ELSE to_jsonb({child}) || jsonb_build_object({pairs}) END")
+        else:
+            expr = f"row_to_json({child})"
+        selects.append((name, expr))
+    return selects
+
+
+def expand_sql(entity, tree, sql, order=None):
+    # The base query (filters, keyset, LIMIT) runs first as a subquery; only
+    # its rows are joined to their referenced rows by primary key, and each
+    # reference comes back as a nested JSON object (null when missing).
+    joins = []
+    selects = _joins(entity, tree, 't', joins)
+    columns = ', '.join(f"{expr} AS {name}" for name, expr in selects)
+    expanded = f"SELECT t.*, {columns} FROM ({sql}) t {' '.join(joins)}"
+    if order:
+        expanded += f" ORDER BY {order}"
+    return expanded
+
+
+def expansion(entity, tree):
+    # Keyword arguments for build_list_query/paginated_list: the foreign
+    # keys must survive a ?fields= projection for the joins to work.
+    if tree is None:
+        return {}
+    return {
+        'include': tuple(entity.references[name][0] for name in tree),
+        'wrap': lambda sql, order: expand_sql(entity, tree, sql, order),
+    }
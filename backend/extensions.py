@@ -1,4 +1,6 @@
 # backend/extensions.py
 from flask_sqlalchemy import SQLAlchemy
+from cache import Cache
 
 db = SQLAlchemy()
+cache = Cache()
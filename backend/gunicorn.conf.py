@@ -0,0 +1,45 @@
+# backend/gunicorn.conf.py
+#
+# gunicorn -c gunicorn.conf.py wsgi:app
+# Each worker keeps its own pool of up to DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections; the worker count is capped so that all of them together fit
+# DB_CONNECTION_BUDGET.
+import multiprocessing
+import os
+
+from routes.config import Config, env_int
+
+bind = os.getenv('BIND', f"0.0.0.0:{os.getenv('PORT', '8000')}")
+# PostgreSQL's max_connections (100 by default) less what migrations, cron
+# jobs and psql sessions need is what all workers may open between them.
+connection_budget = env_int('DB_CONNECTION_BUDGET', 90)
+connections_per_worker = Config.DB_POOL_SIZE + Config.DB_MAX_OVERFLOW
+workers = max(1, min(
+    env_int('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1),
+    connection_budget // connections_per_worker,
+))
+# gthread workers heartbeat from their main loop, so timeout only catches a
+# hung worker; SSE streams, ?wait= long-polls and streaming exports run as
+# long as they need on their own thread. A sync worker would be killed
+# after timeout seconds in the middle of any of them.
+worker_class = os.getenv('WEB_WORKER_CLASS', 'gthread')
+threads = env_int('WEB_THREADS', 8)
+timeout = env_int('WEB_TIMEOUT', 30)
+graceful_timeout = env_int('WEB_GRACEFUL_TIMEOUT', 30)
+keepalive = env_int('WEB_KEEPALIVE', 5)
+# Recycle workers periodically; jitter keeps them from restarting together.
+max_requests = env_int('WEB_MAX_REQUESTS', 0)
+max_requests_jitter = max_requests // 10
+
+# Import the app (blueprints, compiled statements) once in the master so
+# workers fork with it already loaded.
+preload_app = True
+
+
+def post_fork(server, worker):
+    # Runs in the new worker before it accepts connections, so a worker only
+    # joins the listen socket once its pool and statements are warm.
+    from wsgi import app
+    from warmup import start_background
+    start_background(app)
+    server.log.info("worker %s warm: %s", worker.pid, app.extensions['warmup'])
@@ -0,0 +1,95 @@
+# backend/idempotency.py
+import hashlib
+
+from flask import current_app, g, jsonify, make_response, request
+from sqlalchemy import text
+from cache import MemoryBackend
+from extensions import db
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+# Claims the key, or takes over an expired one. A live row makes this return
+# nothing; if that row's transaction is still running, PostgreSQL waits for
+# it first, so a concurrent retry replays the original instead of racing it.
+CLAIM_SQL = text("""
+    INSERT INTO humatrace.idempotency_keys (endpoint, key, fingerprint, expires_at)
+    VALUES (:endpoint, :key, :fingerprint, (now() AT TIME ZONE 'utc') + make_interval(hours => :ttl_hours))
+    ON CONFLICT (endpoint, key) DO UPDATE
+        SET fingerprint = EXCLUDED.fingerprint, status = NULL, body = NULL, expires_at = EXCLUDED.expires_at
+        WHERE idempotency_keys.expires_at <= now() AT TIME ZONE 'utc'
+    RETURNING 1
+""")
+LOOKUP_SQL = text("""
+    SELECT fingerprint, status, body,
+           extract(epoch FROM expires_at - (now() AT TIME ZONE 'utc')) AS ttl
+    FROM humatrace.idempotency_keys
+    WHERE endpoint = :endpoint AND key = :key AND expires_at > now() AT TIME ZONE 'utc'
+""")
+RECORD_SQL = text("""
+    UPDATE humatrace.idempotency_keys SET status = :status, body = :body
+    WHERE endpoint = :endpoint AND key = :key
+""")
+
+
+def init_app(app):
+    # Completed responses recently seen in this process; the table stays the
+    # source of truth across workers and restarts.
+    app.extensions['idempotency'] = MemoryBackend(app.config['IDEMPOTENCY_CACHE_ENTRIES'])
+
+
+def replay(stored, fingerprint):
+    stored_fingerprint, status, body = stored
+    if stored_fingerprint != fingerprint:
+        return jsonify({"error": f"{HEADER} was already used with a different request body"}), 422
+    response = make_response(body, status)
+    response.mimetype = 'application/json'
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def begin():
+    # Called first thing in a create handler. Returns the response to send
+    # back for a retried key, or None once this request owns the key (or
+    # sent none) and should go ahead.
+    key = request.headers.get(HEADER)
+    if key is None:
+        return None
+    if not 0 < len(key) <= MAX_KEY_LENGTH:
+        return jsonify({"error": f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters"}), 400
+    params = {
+        'endpoint': request.endpoint,
+        'key': key,
+        'fingerprint': hashlib.blake2b(request.get_data(), digest_size=16).digest(),
+    }
+    recent = current_app.extensions['idempotency']
+    stored = recent.get(f"{params['endpoint']}:{key}")
+    if stored is not None:
+        return replay(stored, params['fingerprint'])
+
+    ttl_hours = current_app.config['IDEMPOTENCY_TTL_HOURS']
+    if db.session.execute(CLAIM_SQL, dict(params, ttl_hours=ttl_hours)).first() is not None:
+        g.idempotency = params
+        return None
+    row = db.session.execute(LOOKUP_SQL, params).first()
+    db.session.rollback()
+    if row is None or row.status is None:
+        # Expired or released between the claim and the lookup; rare enough
+        # to hand back to the client rather than loop.
+        return jsonify({"error": f"{HEADER} is being processed, retry"}), 409
+    stored = (bytes(row.fingerprint), row.status, bytes(row.body))
+    recent.set(f"{params['endpoint']}:{key}", stored, max(1, int(row.ttl)))
+    return replay(stored, params['fingerprint'])
+
+
+def record(response, status):
+    # Stores the response with the claimed key, inside the transaction the
+    # caller is about to commit, so the rows and the key land together.
+    response.status_code = status
+    params = g.pop('idempotency', None)
+    if params is not None:
+        db.session.execute(RECORD_SQL, {
+            'endpoint': params['endpoint'], 'key': params['key'],
+            'status': status, 'body': response.get_data(),
+        })
+    return response
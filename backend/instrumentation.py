@@ -0,0 +1,151 @@
+# backend/instrumentation.py
+import json
+import logging
+import threading
+import time
+from bisect import bisect_left
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('humatrace.requests')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    # Minimal Prometheus histogram keyed by (route, method). Counts are per
+    # process; scrape every worker or aggregate upstream.
+
+    def __init__(self, name, help, buckets):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for (route, method), (counts, total, value_sum) in sorted(self._series.items()):
+                label = f'route="{route}",method="{method}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'{self.name}_bucket{{{label},le="+Inf"}} {total}')
+                lines.append(f'{self.name}_sum{{{label}}} {value_sum}')
+                lines.append(f'{self.name}_count{{{label}}} {total}')
+        return '\n'.join(lines)
+
+
+request_duration = Histogram(
+    'humatrace_request_duration_seconds', 'Wall time per request.', DURATION_BUCKETS)
+db_duration = Histogram(
+    'humatrace_db_duration_seconds', 'Time spent executing SQL per request.', DURATION_BUCKETS)
+serialize_duration = Histogram(
+    'humatrace_serialize_duration_seconds', 'Time spent encoding JSON per request.', DURATION_BUCKETS)
+db_statements = Histogram(
+    'humatrace_db_statements', 'SQL statements executed per request.', STATEMENT_BUCKETS)
+HISTOGRAMS = (request_duration, db_duration, serialize_duration, db_statements)
+
+
+def _timing():
+    if has_request_context():
+        return g.get('timing')
+    return None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and _timing() is not None:
+        context.humatrace_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timing = _timing()
+    started = getattr(context, 'humatrace_started', None)
+    if timing is not None and started is not None:
+        timing['db'] += time.perf_counter() - started
+        timing['statements'] += 1
+
+
+def _start_request():
+    g.timing = {'started': time.perf_counter(), 'db': 0.0, 'statements': 0, 'serialize': 0.0}
+
+
+def _finish_request(response):
+    timing = g.pop('timing', None)
+    if timing is None:
+        return response
+    total = time.perf_counter() - timing['started']
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    labels = (route, request.method)
+    request_duration.observe(labels, total)
+    db_duration.observe(labels, timing['db'])
+    serialize_duration.observe(labels, timing['serialize'])
+    db_statements.observe(labels, timing['statements'])
+
+    response.headers.add('Server-Timing', (
+        f'db;dur={timing["db"] * 1000:.2f};desc="{timing["statements"]} queries", '
+        f'serialize;dur={timing["serialize"] * 1000:.2f}, '
+        f'total;dur={total * 1000:.2f}'
+    ))
+    logger.info(json.dumps({
+        'method': request.method,
+        'route': route,
+        'path': request.path,
+        'status': response.status_code,
+        'duration_ms': round(total * 1000, 2),
+        'db_ms': round(timing['db'] * 1000, 2),
+        'db_statements': timing['statements'],
+        'serialize_ms': round(timing['serialize'] * 1000, 2),
+    }))
+    return response
+
+
+def _timed_json_response(response):
+    def wrapper(*args, **kwargs):
+        timing = _timing()
+        if timing is None:
+            return response(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            return response(*args, **kwargs)
+        finally:
+            timing['serialize'] += time.perf_counter() - started
+    return wrapper
+
+
+def metrics():
+    body = '\n'.join(h.render() for h in HISTOGRAMS) + '\n'
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+
+def init_app(app):
+    # Opt-in (INSTRUMENTATION_ENABLED): adds Server-Timing headers, one JSON
+    # log line per request and a Prometheus /metrics endpoint.
+    if not app.config.get('INSTRUMENTATION_ENABLED'):
+        return
+    if not logger.handlers:
+        logger.addHandler(logging.StreamHandler())
+        logger.setLevel(logging.INFO)
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+    app.json.response = _timed_json_response(app.json.response)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+    app.add_url_rule('/metrics', 'metrics', metrics, methods=['GET'])
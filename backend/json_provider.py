@@ -0,0 +1,65 @@
+# backend/json_provider.py
+import json
+from collections.abc import Mapping
+from datetime import date, datetime, time
+from decimal import Decimal
+from uuid import UUID
+
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row
+
+try:
+    import orjson
+except ImportError:  # optional: fall back to the stdlib encoder
+    orjson = None
+
+
+def encode_value(obj):
+    # Handles what the encoder cannot emit natively. Handlers pass SQLAlchemy
+    # Row objects straight to jsonify; zipping them against their field names
+    # here is much cheaper than building dict(row._mapping) up front.
+    if isinstance(obj, Row):
+        return dict(zip(obj._fields, obj))
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class HumaTraceJSONProvider(DefaultJSONProvider):
+    # Uses orjson when installed; both paths emit ISO 8601 timestamps,
+    # string UUIDs and numeric Decimals so responses are identical.
+    default = staticmethod(encode_value)
+    sort_keys = False
+    ensure_ascii = False
+
+    def dumps(self, obj, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.dumps(obj, default=encode_value).decode()
+        if not kwargs:
+            kwargs['separators'] = (',', ':')
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        if orjson is not None:
+            option = orjson.OPT_APPEND_NEWLINE
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            body = orjson.dumps(obj, default=encode_value, option=option)
+        elif pretty:
+            body = json.dumps(obj, default=encode_value, ensure_ascii=False, indent=2) + '\n'
+        else:
+            body = json.dumps(obj, default=encode_value, ensure_ascii=False, separators=(',', ':')) + '\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
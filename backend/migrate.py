@@ -0,0 +1,181 @@
+# backend/migrate.py
+import hashlib
+import os
+import re
+import sys
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from sqlalchemy import text
+from extensions import db
+import partitions
+from dashboard import refresh_stats
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.sql$')
+INDEX_NAME = re.compile(r'CREATE\s+(?:UNIQUE\s+)?INDEX\s+(?:CONCURRENTLY\s+)?(?:IF\s+NOT\s+EXISTS\s+)?(\w+)', re.I)
+
+VERSION_TABLE_SQL = """
+    CREATE SCHEMA IF NOT EXISTS humatrace;
+    CREATE TABLE IF NOT EXISTS humatrace.schema_migrations (
+        version integer PRIMARY KEY,
+        name text NOT NULL,
+        checksum text NOT NULL,
+        applied_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+    );
+"""
+
+# Backfills and table rewrites run well past the per-request
+# statement_timeout the engine sets (DB_STATEMENT_TIMEOUT_MS), so it is
+# lifted for the migration's own transaction; lock_timeout is set instead.
+TIMEOUTS_SQL = "SET LOCAL statement_timeout = 0; SET LOCAL lock_timeout = %s"
+
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        with open(path, encoding='utf-8') as f:
+            self.sql = f.read()
+        self.checksum = hashlib.sha256(self.sql.encode()).hexdigest()
+
+    def index_names(self):
+        return INDEX_NAME.findall(self.sql)
+
+
+def discover():
+    migrations = []
+    for filename in sorted(os.listdir(MIGRATIONS_DIR)):
+        match = MIGRATION_FILE.match(filename)
+        if match:
+            migrations.append(Migration(
+                int(match.group(1)), match.group(2), os.path.join(MIGRATIONS_DIR, filename)
+            ))
+    return migrations
+
+
+def applied_versions(conn):
+    conn.exec_driver_sql(VERSION_TABLE_SQL)
+    rows = conn.execute(text("SELECT version, checksum FROM humatrace.schema_migrations"))
+    return {row.version: row.checksum for row in rows}
+
+
+def upgrade(engine, lock_timeout_ms=0):
+    # Each migration runs in its own transaction together with its
+    # schema_migrations row, so a failure leaves no half-applied version.
+    applied = []
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+    for migration in discover():
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            # Raw cursor without parameters, so '%' in the SQL (format()
+            # patterns, LIKE) is not taken for a placeholder.
+            with conn.connection.cursor() as cursor:
+                cursor.execute(TIMEOUTS_SQL, (lock_timeout_ms,))
+                cursor.execute(migration.sql)
+            conn.execute(
+                text("INSERT INTO humatrace.schema_migrations (version, name, checksum) "
+                     "VALUES (:version, :name, :checksum)"),
+                {'version': migration.version, 'name': migration.name, 'checksum': migration.checksum}
+            )
+        applied.append(migration)
+    return applied
+
+
+def status(engine):
+    migrations = discover()
+    with engine.begin() as conn:
+        done = applied_versions(conn)
+        existing = {row.indexname for row in conn.execute(
+            text("SELECT indexname FROM pg_indexes WHERE schemaname = 'humatrace'")
+        )}
+    return {
+        'applied': [m for m in migrations if m.version in done],
+        'pending': [m for m in migrations if m.version not in done],
+        'modified': [m for m in migrations if m.version in done and done[m.version] != m.checksum],
+        'missing_indexes': [name for m in migrations if m.version in done
+                            for name in m.index_names() if name not in existing],
+    }
+
+
+db_cli = AppGroup('db', help='Manage the humatrace schema.')
+
+
+@db_cli.command('upgrade')
+def upgrade_command():
+    """Apply pending migrations."""
+    config = current_app.config
+    applied = upgrade(db.engine, config['MIGRATION_LOCK_TIMEOUT_MS'])
+    for migration in applied:
+        click.echo(f"applied {migration.version:04d}_{migration.name}")
+    if not applied:
+        click.echo("schema is up to date")
+    for name in partitions.ensure_partitions(db.engine, config['PARTITION_MONTHS_AHEAD'],
+                                             lock_timeout_ms=config['MIGRATION_LOCK_TIMEOUT_MS']):
+        click.echo(f"created partition humatrace.{name}")
+
+
+@db_cli.command('status')
+def status_command():
+    """Report pending migrations and drift from the shipped schema."""
+    report = status(db.engine)
+    for migration in report['applied']:
+        click.echo(f"applied   {migration.version:04d}_{migration.name}")
+    for migration in report['pending']:
+        click.echo(f"pending   {migration.version:04d}_{migration.name}")
+    for migration in report['modified']:
+        click.echo(f"modified  {migration.version:04d}_{migration.name} (file changed after it was applied)")
+    for name in report['missing_indexes']:
+        click.echo(f"missing   index humatrace.{name}")
+    if report['pending'] or report['modified'] or report['missing_indexes']:
+        sys.exit(1)
+
+
+@db_cli.command('partitions')
+@click.option('--drop', is_flag=True, help='Drop expired partitions instead of archiving them.')
+def partitions_command(drop):
+    """Create upcoming monthly partitions and detach expired ones."""
+    config = current_app.config
+    lock_timeout_ms = config['MIGRATION_LOCK_TIMEOUT_MS']
+    for name in partitions.ensure_partitions(db.engine, config['PARTITION_MONTHS_AHEAD'],
+                                             lock_timeout_ms=lock_timeout_ms):
+        click.echo(f"created partition humatrace.{name}")
+    if config['PARTITION_RETENTION_MONTHS'] > 0:
+        for name in partitions.detach_expired(db.engine, config['PARTITION_RETENTION_MONTHS'], drop,
+                                              lock_timeout_ms=lock_timeout_ms):
+            click.echo(f"{'dropped' if drop else 'archived'} partition {name}")
+
+
+@db_cli.command('prune-changes')
+def prune_changes_command():
+    """Delete relayed change_log rows older than CHANGES_RETENTION_DAYS."""
+    days = current_app.config['CHANGES_RETENTION_DAYS']
+    with db.engine.begin() as conn:
+        deleted = conn.execute(text(
+            "DELETE FROM humatrace.change_log "
+            "WHERE seq IS NOT NULL AND changed_at < (now() AT TIME ZONE 'utc') - make_interval(days => :days)"
+        ), {'days': days}).rowcount
+    click.echo(f"deleted {deleted} change_log rows older than {days} days")
+
+
+@db_cli.command('prune-idempotency-keys')
+def prune_idempotency_keys_command():
+    """Delete expired Idempotency-Key records."""
+    with db.engine.begin() as conn:
+        deleted = conn.execute(text(
+            "DELETE FROM humatrace.idempotency_keys WHERE expires_at <= now() AT TIME ZONE 'utc'"
+        )).rowcount
+    click.echo(f"deleted {deleted} expired idempotency keys")
+
+
+@db_cli.command('refresh-stats')
+def refresh_stats_command():
+    """Recompute the GET /stats/dashboard snapshot now."""
+    if refresh_stats(current_app):
+        click.echo("dashboard stats refreshed")
+    else:
+        click.echo("dashboard stats refresh already running in another session")
@@ -0,0 +1,115 @@
+-- Base humatrace schema. IF NOT EXISTS lets this adopt a database whose
+-- tables were created by hand before migrations shipped with the backend.
+
+CREATE SCHEMA IF NOT EXISTS humatrace;
+
+CREATE TABLE IF NOT EXISTS humatrace.patients (
+    id uuid PRIMARY KEY,
+    first_name text,
+    last_name text,
+    gender text,
+    phone text,
+    date_of_birth date
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.doctors (
+    id uuid PRIMARY KEY,
+    first_name text,
+    last_name text,
+    specialty text,
+    phone text,
+    email text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.issues (
+    id uuid PRIMARY KEY,
+    name text,
+    severity text,
+    created_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.medications (
+    id uuid PRIMARY KEY,
+    name text,
+    type text,
+    description text,
+    side_effects text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.tests (
+    id uuid PRIMARY KEY,
+    name text,
+    type text,
+    description text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.appointments (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    doctor_id uuid REFERENCES humatrace.doctors (id),
+    scheduled_at timestamp,
+    status text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.birth_records (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    date_of_birth date,
+    place_of_birth text,
+    delivery_method text,
+    birth_weight numeric
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.diagnoses (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    issue_id uuid REFERENCES humatrace.issues (id),
+    description text,
+    diagnosed_at timestamp
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.treatments (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    diagnosis_id uuid REFERENCES humatrace.diagnoses (id),
+    treatment_plan text,
+    started_at timestamp,
+    ended_at timestamp
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.medication_history (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    medication_id uuid REFERENCES humatrace.medications (id),
+    dosage text,
+    start_date date,
+    end_date date,
+    notes text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.patient_vitals (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    height_cm numeric,
+    weight_kg numeric,
+    blood_pressure text,
+    temperature_celsius numeric,
+    recorded_at timestamp
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.sessions (
+    id uuid PRIMARY KEY,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    doctor_id uuid REFERENCES humatrace.doctors (id),
+    started_at timestamp,
+    ended_at timestamp,
+    notes text
+);
+
+CREATE TABLE IF NOT EXISTS humatrace.test_results (
+    id uuid PRIMARY KEY,
+    test_id uuid REFERENCES humatrace.tests (id),
+    patient_id uuid REFERENCES humatrace.patients (id),
+    result text,
+    taken_at timestamp
+);
@@ -0,0 +1,40 @@
+-- Indexes for the hot query shapes:
+--   (patient_id, time)  per-patient filters and GET /patient/<id>/timeline
+--   (time, id)          keyset pages ordered by the time column
+--   (<fk>)              foreign-key lookups and ON DELETE checks
+
+CREATE INDEX IF NOT EXISTS patient_vitals_patient_recorded_idx ON humatrace.patient_vitals (patient_id, recorded_at);
+CREATE INDEX IF NOT EXISTS patient_vitals_recorded_idx ON humatrace.patient_vitals (recorded_at, id);
+
+CREATE INDEX IF NOT EXISTS test_results_patient_taken_idx ON humatrace.test_results (patient_id, taken_at);
+CREATE INDEX IF NOT EXISTS test_results_taken_idx ON humatrace.test_results (taken_at, id);
+CREATE INDEX IF NOT EXISTS test_results_test_idx ON humatrace.test_results (test_id);
+
+CREATE INDEX IF NOT EXISTS appointments_patient_scheduled_idx ON humatrace.appointments (patient_id, scheduled_at);
+CREATE INDEX IF NOT EXISTS appointments_doctor_scheduled_idx ON humatrace.appointments (doctor_id, scheduled_at);
+CREATE INDEX IF NOT EXISTS appointments_scheduled_idx ON humatrace.appointments (scheduled_at, id);
+
+CREATE INDEX IF NOT EXISTS sessions_patient_started_idx ON humatrace.sessions (patient_id, started_at);
+CREATE INDEX IF NOT EXISTS sessions_doctor_started_idx ON humatrace.sessions (doctor_id, started_at);
+CREATE INDEX IF NOT EXISTS sessions_started_idx ON humatrace.sessions (started_at, id);
+
+CREATE INDEX IF NOT EXISTS diagnoses_patient_diagnosed_idx ON humatrace.diagnoses (patient_id, diagnosed_at);
+CREATE INDEX IF NOT EXISTS diagnoses_issue_idx ON humatrace.diagnoses (issue_id);
+CREATE INDEX IF NOT EXISTS diagnoses_diagnosed_idx ON humatrace.diagnoses (diagnosed_at, id);
+
+CREATE INDEX IF NOT EXISTS treatments_patient_started_idx ON humatrace.treatments (patient_id, started_at);
+CREATE INDEX IF NOT EXISTS treatments_diagnosis_idx ON humatrace.treatments (diagnosis_id);
+CREATE INDEX IF NOT EXISTS treatments_started_idx ON humatrace.treatments (started_at, id);
+
+CREATE INDEX IF NOT EXISTS medication_history_patient_start_idx ON humatrace.medication_history (patient_id, start_date);
+CREATE INDEX IF NOT EXISTS medication_history_medication_idx ON humatrace.medication_history (medication_id);
+CREATE INDEX IF NOT EXISTS medication_history_start_idx ON humatrace.medication_history (start_date, id);
+
+CREATE INDEX IF NOT EXISTS birth_records_patient_idx ON humatrace.birth_records (patient_id);
+CREATE INDEX IF NOT EXISTS birth_records_date_of_birth_idx ON humatrace.birth_records (date_of_birth, id);
+
+CREATE INDEX IF NOT EXISTS issues_created_idx ON humatrace.issues (created_at, id);
+CREATE INDEX IF NOT EXISTS issues_severity_idx ON humatrace.issues (severity);
+CREATE INDEX IF NOT EXISTS doctors_specialty_idx ON humatrace.doctors (specialty);
+CREATE INDEX IF NOT EXISTS medications_type_idx ON humatrace.medications (type);
+CREATE INDEX IF NOT EXISTS tests_type_idx ON humatrace.tests (type);
@@ -0,0 +1,64 @@
+-- Convert patient_vitals and test_results to tables range-partitioned by
+-- month on recorded_at / taken_at. Existing rows are copied into the DEFAULT
+-- partition; `flask db partitions` (also run by `flask db upgrade`) then
+-- creates the monthly partitions and moves those rows into them.
+--
+-- The partition key must be part of the primary key and NOT NULL. Legacy
+-- rows without a timestamp are stamped 1970-01-01 so they stay identifiable.
+
+ALTER TABLE humatrace.patient_vitals RENAME TO patient_vitals_legacy;
+ALTER INDEX IF EXISTS humatrace.patient_vitals_pkey RENAME TO patient_vitals_legacy_pkey;
+DROP INDEX IF EXISTS humatrace.patient_vitals_patient_recorded_idx;
+DROP INDEX IF EXISTS humatrace.patient_vitals_recorded_idx;
+
+CREATE TABLE humatrace.patient_vitals (
+    id uuid NOT NULL,
+    patient_id uuid REFERENCES humatrace.patients (id),
+    height_cm numeric,
+    weight_kg numeric,
+    blood_pressure text,
+    temperature_celsius numeric,
+    recorded_at timestamp NOT NULL,
+    PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
+
+CREATE TABLE humatrace.patient_vitals_default PARTITION OF humatrace.patient_vitals DEFAULT;
+
+INSERT INTO humatrace.patient_vitals
+    (id, patient_id, height_cm, weight_kg, blood_pressure, temperature_celsius, recorded_at)
+SELECT id, patient_id, height_cm, weight_kg, blood_pressure, temperature_celsius,
+       COALESCE(recorded_at, '1970-01-01')
+FROM humatrace.patient_vitals_legacy;
+
+DROP TABLE humatrace.patient_vitals_legacy;
+
+CREATE INDEX IF NOT EXISTS patient_vitals_patient_recorded_idx ON humatrace.patient_vitals (patient_id, recorded_at);
+CREATE INDEX IF NOT EXISTS patient_vitals_recorded_idx ON humatrace.patient_vitals (recorded_at, id);
+
+
+ALTER TABLE humatrace.test_results RENAME TO test_results_legacy;
+ALTER INDEX IF EXISTS humatrace.test_results_pkey RENAME TO test_results_legacy_pkey;
+DROP INDEX IF EXISTS humatrace.test_results_patient_taken_idx;
+DROP INDEX IF EXISTS humatrace.test_results_taken_idx;
+DROP INDEX IF EXISTS humatrace.test_results_test_idx;
+
+CREATE TABLE humatrace.test_results (
+    id uuid NOT NULL,
+    test_id uuid REFERENCES humatrace.tests (id),
+    patient_id uuid REFERENCES humatrace.patients (id),
+    result text,
+    taken_at timestamp NOT NULL,
+    PRIMARY KEY (id, taken_at)
+) PARTITION BY RANGE (taken_at);
+
+CREATE TABLE humatrace.test_results_default PARTITION OF humatrace.test_results DEFAULT;
+
+INSERT INTO humatrace.test_results (id, test_id, patient_id, result, taken_at)
+SELECT id, test_id, patient_id, result, COALESCE(taken_at, '1970-01-01')
+FROM humatrace.test_results_legacy;
+
+DROP TABLE humatrace.test_results_legacy;
+
+CREATE INDEX IF NOT EXISTS test_results_patient_taken_idx ON humatrace.test_results (patient_id, taken_at);
+CREATE INDEX IF NOT EXISTS test_results_taken_idx ON humatrace.test_results (taken_at, id);
+CREATE INDEX IF NOT EXISTS test_results_test_idx ON humatrace.test_results (test_id);
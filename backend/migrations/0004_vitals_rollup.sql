@@ -0,0 +1,157 @@
+-- Hourly rollup of patient_vitals backing GET /patient_vitals/series.
+-- Each row keeps count/sum/min/max per measure, so hourly buckets are read
+-- directly and daily buckets are re-aggregated from at most 24 rows each.
+-- blood_pressure ('120/80') is parsed into systolic and diastolic.
+
+CREATE TABLE IF NOT EXISTS humatrace.patient_vitals_hourly (
+    patient_id uuid NOT NULL,
+    bucket timestamp NOT NULL,
+    samples integer NOT NULL,
+    height_cm_count integer NOT NULL,
+    height_cm_sum numeric,
+    height_cm_min numeric,
+    height_cm_max numeric,
+    weight_kg_count integer NOT NULL,
+    weight_kg_sum numeric,
+    weight_kg_min numeric,
+    weight_kg_max numeric,
+    temperature_celsius_count integer NOT NULL,
+    temperature_celsius_sum numeric,
+    temperature_celsius_min numeric,
+    temperature_celsius_max numeric,
+    systolic_count integer NOT NULL,
+    systolic_sum numeric,
+    systolic_min numeric,
+    systolic_max numeric,
+    diastolic_count integer NOT NULL,
+    diastolic_sum numeric,
+    diastolic_min numeric,
+    diastolic_max numeric,
+    PRIMARY KEY (patient_id, bucket)
+);
+
+-- Recomputes the given (patient_id, hour) buckets from the raw rows.
+-- Concurrent writers to the same bucket are serialized on the rollup rows
+-- themselves; row locks live on the tuples rather than in the shared lock
+-- table, so a statement may touch any number of buckets. Each bucket gets a
+-- placeholder row (ON CONFLICT waits for a concurrent writer's insert to
+-- commit), then all of them are locked FOR UPDATE in key order. A row a
+-- concurrent writer deleted in between (its bucket emptied, or recomputed
+-- below) is missing from the locked set, so the loop claims it again. Every
+-- later statement then sees the rows the previous writer committed.
+-- Placeholders are deleted with the rest before the rebuild, so buckets
+-- without raw rows never appear.
+CREATE OR REPLACE FUNCTION humatrace.refresh_vitals_hourly(p_ids uuid[], p_buckets timestamp[])
+RETURNS void LANGUAGE plpgsql AS $$
+DECLARE
+    wanted integer;
+    locked integer;
+BEGIN
+    SELECT count(*) INTO wanted
+    FROM (SELECT DISTINCT patient_id, bucket FROM unnest(p_ids, p_buckets) AS k(patient_id, bucket)) k;
+
+    LOOP
+        INSERT INTO humatrace.patient_vitals_hourly
+            (patient_id, bucket, samples, height_cm_count, weight_kg_count,
+             temperature_celsius_count, systolic_count, diastolic_count)
+        SELECT DISTINCT k.patient_id, k.bucket, 0, 0, 0, 0, 0, 0
+        FROM unnest(p_ids, p_buckets) AS k(patient_id, bucket)
+        ORDER BY 1, 2
+        ON CONFLICT (patient_id, bucket) DO NOTHING;
+
+        SELECT count(*) INTO locked FROM (
+            SELECT 1 FROM humatrace.patient_vitals_hourly r
+            JOIN (SELECT DISTINCT patient_id, bucket FROM unnest(p_ids, p_buckets) AS k(patient_id, bucket)) k
+              ON r.patient_id = k.patient_id AND r.bucket = k.bucket
+            ORDER BY r.patient_id, r.bucket
+            FOR UPDATE OF r
+        ) l;
+        EXIT WHEN locked = wanted;
+    END LOOP;
+
+    DELETE FROM humatrace.patient_vitals_hourly r
+    USING unnest(p_ids, p_buckets) AS k(patient_id, bucket)
+    WHERE r.patient_id = k.patient_id AND r.bucket = k.bucket;
+
+    INSERT INTO humatrace.patient_vitals_hourly
+    SELECT v.patient_id, k.bucket, count(*),
+           count(v.height_cm), sum(v.height_cm), min(v.height_cm), max(v.height_cm),
+           count(v.weight_kg), sum(v.weight_kg), min(v.weight_kg), max(v.weight_kg),
+           count(v.temperature_celsius), sum(v.temperature_celsius),
+           min(v.temperature_celsius), max(v.temperature_celsius),
+           count(bp.systolic), sum(bp.systolic), min(bp.systolic), max(bp.systolic),
+           count(bp.diastolic), sum(bp.diastolic), min(bp.diastolic), max(bp.diastolic)
+    FROM unnest(p_ids, p_buckets) AS k(patient_id, bucket)
+    JOIN humatrace.patient_vitals v
+      ON v.patient_id = k.patient_id
+     AND v.recorded_at >= k.bucket AND v.recorded_at < k.bucket + interval '1 hour'
+    CROSS JOIN LATERAL (
+        SELECT substring(v.blood_pressure FROM '^\s*(\d+)\s*/')::numeric AS systolic,
+               substring(v.blood_pressure FROM '/\s*(\d+)\s*$')::numeric AS diastolic
+    ) bp
+    GROUP BY v.patient_id, k.bucket;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION humatrace.patient_vitals_rollup_new() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM humatrace.refresh_vitals_hourly(array_agg(patient_id), array_agg(bucket))
+    FROM (SELECT DISTINCT patient_id, date_trunc('hour', recorded_at) AS bucket
+          FROM new_rows WHERE patient_id IS NOT NULL) k;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION humatrace.patient_vitals_rollup_old() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM humatrace.refresh_vitals_hourly(array_agg(patient_id), array_agg(bucket))
+    FROM (SELECT DISTINCT patient_id, date_trunc('hour', recorded_at) AS bucket
+          FROM old_rows WHERE patient_id IS NOT NULL) k;
+    RETURN NULL;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION humatrace.patient_vitals_rollup_changed() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    PERFORM humatrace.refresh_vitals_hourly(array_agg(patient_id), array_agg(bucket))
+    FROM (SELECT patient_id, date_trunc('hour', recorded_at) AS bucket FROM old_rows
+          UNION
+          SELECT patient_id, date_trunc('hour', recorded_at) FROM new_rows) k
+    WHERE patient_id IS NOT NULL;
+    RETURN NULL;
+END
+$$;
+
+-- Statement-level triggers: a bulk insert refreshes each touched bucket once.
+CREATE TRIGGER patient_vitals_rollup_insert
+    AFTER INSERT ON humatrace.patient_vitals
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION humatrace.patient_vitals_rollup_new();
+
+CREATE TRIGGER patient_vitals_rollup_update
+    AFTER UPDATE ON humatrace.patient_vitals
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION humatrace.patient_vitals_rollup_changed();
+
+CREATE TRIGGER patient_vitals_rollup_delete
+    AFTER DELETE ON humatrace.patient_vitals
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION humatrace.patient_vitals_rollup_old();
+
+-- Backfill from existing rows in one aggregate pass. The table was created
+-- above and is still empty, so there is nothing to lock or recompute.
+INSERT INTO humatrace.patient_vitals_hourly
+SELECT v.patient_id, date_trunc('hour', v.recorded_at), count(*),
+       count(v.height_cm), sum(v.height_cm), min(v.height_cm), max(v.height_cm),
+       count(v.weight_kg), sum(v.weight_kg), min(v.weight_kg), max(v.weight_kg),
+       count(v.temperature_celsius), sum(v.temperature_celsius),
+       min(v.temperature_celsius), max(v.temperature_celsius),
+       count(bp.systolic), sum(bp.systolic), min(bp.systolic), max(bp.systolic),
+       count(bp.diastolic), sum(bp.diastolic), min(bp.diastolic), max(bp.diastolic)
+FROM humatrace.patient_vitals v
+CROSS JOIN LATERAL (
+    SELECT substring(v.blood_pressure FROM '^\s*(\d+)\s*/')::numeric AS systolic,
+           substring(v.blood_pressure FROM '/\s*(\d+)\s*$')::numeric AS diastolic
+) bp
+WHERE v.patient_id IS NOT NULL
+GROUP BY 1, 2;
@@ -0,0 +1,22 @@
+-- Indexes behind GET /patient/search, /doctor/search and /medication/search.
+-- The indexed expressions must match search.py (FULL_NAME, PHONE_DIGITS and
+-- the medications tsvector) exactly for the planner to use them.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS patients_full_name_trgm_idx ON humatrace.patients
+    USING gin ((lower(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_phone_digits_trgm_idx ON humatrace.patients
+    USING gin ((regexp_replace(coalesce(phone, ''), '\D', '', 'g')) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS patients_date_of_birth_idx ON humatrace.patients (date_of_birth);
+
+CREATE INDEX IF NOT EXISTS doctors_full_name_trgm_idx ON humatrace.doctors
+    USING gin ((lower(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS doctors_specialty_trgm_idx ON humatrace.doctors
+    USING gin ((lower(coalesce(specialty, ''))) gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS medications_name_trgm_idx ON humatrace.medications
+    USING gin ((lower(coalesce(name, ''))) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS medications_fulltext_idx ON humatrace.medications
+    USING gin (to_tsvector('simple', coalesce(name, '') || ' ' || coalesce(type, '') || ' ' ||
+                                     coalesce(description, '') || ' ' || coalesce(side_effects, '')));
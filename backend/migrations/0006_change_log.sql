@@ -0,0 +1,89 @@
+-- Transactional outbox behind GET /changes. Statement-level triggers on every
+-- entity table append one change_log row per written row inside the writing
+-- transaction, so a change is recorded if and only if the write commits.
+--
+-- Rows are inserted without a seq. Sequence numbers are handed out later by
+-- relay_changes(), only to rows whose transaction is older than every running
+-- one, and only by one relay at a time. A reader that has seen seq N can
+-- therefore never later find a committed change numbered below N.
+
+CREATE TABLE IF NOT EXISTS humatrace.change_log (
+    id bigserial PRIMARY KEY,
+    seq bigint UNIQUE,
+    txid xid8 NOT NULL DEFAULT pg_current_xact_id(),
+    table_name text NOT NULL,
+    op text NOT NULL,
+    row_id uuid NOT NULL,
+    data jsonb,
+    changed_at timestamp NOT NULL DEFAULT (now() AT TIME ZONE 'utc')
+);
+CREATE SEQUENCE IF NOT EXISTS humatrace.change_log_seq;
+CREATE INDEX IF NOT EXISTS change_log_pending_idx ON humatrace.change_log (id) WHERE seq IS NULL;
+
+CREATE OR REPLACE FUNCTION humatrace.capture_changes()
+RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        INSERT INTO humatrace.change_log (table_name, op, row_id)
+        SELECT TG_TABLE_NAME, 'delete', o.id FROM old_rows o;
+    ELSE
+        INSERT INTO humatrace.change_log (table_name, op, row_id, data)
+        SELECT TG_TABLE_NAME, lower(TG_OP), n.id, to_jsonb(n) FROM new_rows n;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION humatrace.relay_changes()
+RETURNS integer LANGUAGE plpgsql AS $$
+DECLARE
+    relayed integer;
+BEGIN
+    -- Another relay is running; its rows become visible when it commits.
+    IF NOT pg_try_advisory_xact_lock(hashtext('humatrace.relay_changes')) THEN
+        RETURN 0;
+    END IF;
+    -- An UPDATE ... FROM may join in any order, so the numbers are drawn in
+    -- the projection over the ordered rows and only then written back.
+    WITH pending AS (
+        SELECT id, nextval('humatrace.change_log_seq') AS seq
+        FROM (
+            SELECT id FROM humatrace.change_log
+            WHERE seq IS NULL AND txid < pg_snapshot_xmin(pg_current_snapshot())
+            ORDER BY id
+            FOR UPDATE
+        ) ordered
+    )
+    UPDATE humatrace.change_log c
+    SET seq = pending.seq
+    FROM pending
+    WHERE c.id = pending.id;
+    GET DIAGNOSTICS relayed = ROW_COUNT;
+    RETURN relayed;
+END;
+$$;
+
+DO $$
+DECLARE
+    t text;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'appointments', 'birth_records', 'diagnoses', 'doctors', 'issues', 'medications',
+        'medication_history', 'patients', 'patient_vitals', 'sessions', 'tests',
+        'test_results', 'treatments'
+    ] LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON humatrace.%I', t || '_changes_insert', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON humatrace.%I', t || '_changes_update', t);
+        EXECUTE format('DROP TRIGGER IF EXISTS %I ON humatrace.%I', t || '_changes_delete', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER INSERT ON humatrace.%I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION humatrace.capture_changes()', t || '_changes_insert', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER UPDATE ON humatrace.%I REFERENCING NEW TABLE AS new_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION humatrace.capture_changes()', t || '_changes_update', t);
+        EXECUTE format(
+            'CREATE TRIGGER %I AFTER DELETE ON humatrace.%I REFERENCING OLD TABLE AS old_rows '
+            'FOR EACH STATEMENT EXECUTE FUNCTION humatrace.capture_changes()', t || '_changes_delete', t);
+    END LOOP;
+END;
+$$;
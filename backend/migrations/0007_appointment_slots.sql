@@ -0,0 +1,31 @@
+-- Appointment slots for GET /doctor/<id>/availability and conflict-free booking.
+-- An appointment occupies [scheduled_at, scheduled_at + duration_minutes); the
+-- exclusion constraint rejects any overlapping, non-cancelled appointment for
+-- the same doctor atomically, whichever request commits first wins. Status is
+-- free text and clients send "Cancelled", so it is compared case-insensitively.
+-- The slot expressions and the status predicate must match availability.py
+-- (APPOINTMENT_SLOT, APPOINTMENT_ACTIVE, SESSION_SLOT).
+--
+-- If this migration fails with "could not create exclusion constraint", the
+-- reported appointments already overlap: cancel or move one of each pair and
+-- run `flask db upgrade` again.
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE humatrace.appointments
+    ADD COLUMN IF NOT EXISTS duration_minutes integer NOT NULL DEFAULT 30
+        CHECK (duration_minutes > 0);
+
+ALTER TABLE humatrace.appointments
+    ADD CONSTRAINT appointments_no_overlap
+    EXCLUDE USING gist (
+        doctor_id WITH =,
+        tsrange(scheduled_at, scheduled_at + duration_minutes * interval '1 minute') WITH &&
+    ) WHERE (doctor_id IS NOT NULL AND scheduled_at IS NOT NULL AND lower(status) IS DISTINCT FROM 'cancelled');
+
+-- Sessions without ended_at count as 30 minutes; GREATEST guards rows whose
+-- ended_at precedes started_at.
+CREATE INDEX IF NOT EXISTS sessions_doctor_slot_idx ON humatrace.sessions USING gist (
+    doctor_id,
+    tsrange(started_at, GREATEST(started_at, COALESCE(ended_at, started_at + interval '30 minutes')))
+) WHERE doctor_id IS NOT NULL AND started_at IS NOT NULL;
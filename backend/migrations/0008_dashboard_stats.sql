@@ -0,0 +1,88 @@
+-- Precomputed figures for GET /stats/dashboard. One row holds the latest
+-- snapshot as JSON, so a request is a primary-key read whatever the table
+-- sizes. refresh_dashboard_stats() recomputes it; the app calls it every
+-- DASHBOARD_REFRESH_SECONDS and `flask db refresh-stats` forces it. Readers
+-- keep seeing the previous snapshot (MVCC) while a refresh runs.
+
+CREATE TABLE IF NOT EXISTS humatrace.dashboard_stats (
+    id smallint PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+    refreshed_at timestamp NOT NULL,
+    duration_ms numeric NOT NULL,
+    data jsonb NOT NULL
+);
+
+-- "Today" and the daily trends use p_timezone's calendar days. Returns false
+-- without doing anything if another session is refreshing or the snapshot
+-- is younger than p_max_age, so every worker can call it on a timer.
+CREATE OR REPLACE FUNCTION humatrace.refresh_dashboard_stats(p_timezone text, p_max_age interval)
+RETURNS boolean LANGUAGE plpgsql AS $$
+DECLARE
+    started timestamptz := clock_timestamp();
+    now_utc timestamp := now() AT TIME ZONE 'utc';
+    today date := CAST(now() AT TIME ZONE p_timezone AS date);
+    -- today's local midnight and that of 13 days earlier, in UTC like the columns
+    today_start timestamp := (CAST(today AS timestamp) AT TIME ZONE p_timezone) AT TIME ZONE 'utc';
+    trend_start timestamp := (CAST(today - 13 AS timestamp) AT TIME ZONE p_timezone) AT TIME ZONE 'utc';
+    snapshot jsonb;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('humatrace.dashboard_stats')) THEN
+        RETURN false;
+    END IF;
+    IF EXISTS (SELECT 1 FROM humatrace.dashboard_stats WHERE refreshed_at > now_utc - p_max_age) THEN
+        RETURN false;
+    END IF;
+
+    SELECT jsonb_build_object(
+        'patients', (SELECT count(*) FROM humatrace.patients),
+        'doctors', (SELECT count(*) FROM humatrace.doctors),
+        'appointments_today', (
+            SELECT jsonb_build_object(
+                'total', COALESCE(sum(n), 0),
+                'by_status', COALESCE(jsonb_object_agg(status, n), '{}'))
+            FROM (SELECT COALESCE(status, 'unknown') AS status, count(*) AS n
+                  FROM humatrace.appointments
+                  WHERE scheduled_at >= today_start AND scheduled_at < today_start + interval '1 day'
+                  GROUP BY 1) s
+        ),
+        'issues_by_severity', (
+            SELECT COALESCE(jsonb_object_agg(severity, n), '{}')
+            FROM (SELECT COALESCE(severity, 'unknown') AS severity, count(*) AS n
+                  FROM humatrace.issues GROUP BY 1) s
+        ),
+        'active_treatments', (
+            SELECT count(*) FROM humatrace.treatments
+            WHERE started_at <= now_utc AND (ended_at IS NULL OR ended_at > now_utc)
+        ),
+        'trends', jsonb_build_object(
+            'appointments_per_day', (
+                SELECT jsonb_agg(jsonb_build_object('date', day, 'count', COALESCE(n, 0)) ORDER BY day)
+                FROM (SELECT today - i AS day FROM generate_series(0, 13) AS i) days
+                LEFT JOIN (SELECT CAST((scheduled_at AT TIME ZONE 'utc') AT TIME ZONE p_timezone AS date) AS local_day,
+                                  count(*) AS n
+                           FROM humatrace.appointments
+                           WHERE scheduled_at >= trend_start AND scheduled_at < today_start + interval '1 day'
+                           GROUP BY 1) a
+                  ON a.local_day = days.day
+            ),
+            'diagnoses_per_day', (
+                SELECT jsonb_agg(jsonb_build_object('date', day, 'count', COALESCE(n, 0)) ORDER BY day)
+                FROM (SELECT today - i AS day FROM generate_series(0, 13) AS i) days
+                LEFT JOIN (SELECT CAST((diagnosed_at AT TIME ZONE 'utc') AT TIME ZONE p_timezone AS date) AS local_day,
+                                  count(*) AS n
+                           FROM humatrace.diagnoses
+                           WHERE diagnosed_at >= trend_start AND diagnosed_at < today_start + interval '1 day'
+                           GROUP BY 1) d
+                  ON d.local_day = days.day
+            )
+        )
+    ) INTO snapshot;
+
+    INSERT INTO humatrace.dashboard_stats (id, refreshed_at, duration_ms, data)
+    VALUES (1, now_utc, round(extract(epoch FROM clock_timestamp() - started)::numeric * 1000, 2), snapshot)
+    ON CONFLICT (id) DO UPDATE
+        SET refreshed_at = EXCLUDED.refreshed_at, duration_ms = EXCLUDED.duration_ms, data = EXCLUDED.data;
+    RETURN true;
+END
+$$;
+
+SELECT humatrace.refresh_dashboard_stats('UTC', interval '0');
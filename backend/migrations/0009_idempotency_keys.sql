@@ -0,0 +1,17 @@
+-- Idempotency-Key store for POST /<entity>/ and /<entity>/bulk. A key is
+-- claimed in the same transaction as the insert and carries the response
+-- that transaction produced, so a retry either waits for the original to
+-- commit and replays it, or (if it rolled back) runs again. Rows expire
+-- after IDEMPOTENCY_TTL_HOURS; `flask db prune-idempotency-keys` deletes them.
+
+CREATE TABLE IF NOT EXISTS humatrace.idempotency_keys (
+    endpoint text NOT NULL,
+    key text NOT NULL,
+    fingerprint bytea NOT NULL,
+    status smallint,
+    body bytea,
+    expires_at timestamp NOT NULL,
+    PRIMARY KEY (endpoint, key)
+);
+
+CREATE INDEX IF NOT EXISTS idempotency_keys_expires_idx ON humatrace.idempotency_keys (expires_at);
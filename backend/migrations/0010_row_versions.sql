@@ -0,0 +1,19 @@
+-- Row version for optimistic concurrency on PUT/PATCH /<entity>/<id>. Every
+-- update statement the API issues sets version = version + 1; a PATCH that
+-- sends the version it read only applies if the row is still at it.
+-- A constant default makes ADD COLUMN a catalog-only change, so this does not
+-- rewrite the tables.
+
+ALTER TABLE humatrace.patients ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.doctors ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.issues ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.medications ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.tests ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.appointments ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.birth_records ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.diagnoses ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.medication_history ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.patient_vitals ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.sessions ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.test_results ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE humatrace.treatments ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
@@ -0,0 +1,192 @@
+# backend/pagination.py
+import base64
+import json
+import uuid
+from datetime import datetime
+
+from flask import request, jsonify
+from sqlalchemy import text
+from extensions import db
+from streaming import stream_rows, wants_stream
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+class InvalidQuery(ValueError):
+    pass
+
+
+def encode_cursor(value, last_id):
+    raw = json.dumps([value, last_id], default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    # Only the exact [value, id] shape encode_cursor produces is accepted, so a
+    # tampered cursor is a 400 here rather than a type error in the database.
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        decoded = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise InvalidQuery("Invalid cursor")
+    if not isinstance(decoded, list) or len(decoded) != 2:
+        raise InvalidQuery("Invalid cursor")
+    value, last_id = decoded
+    if isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))):
+        raise InvalidQuery("Invalid cursor")
+    return value, parse_uuid(last_id, "Invalid cursor")
+
+
+def parse_limit(args):
+    try:
+        limit = int(args.get('limit', DEFAULT_LIMIT))
+    except ValueError:
+        raise InvalidQuery("limit must be an integer")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def parse_timestamp(value, name):
+    if value is None:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidQuery(f"{name} must be an ISO 8601 timestamp")
+
+
+def parse_uuid(value, error):
+    # Ids and *_id columns are uuid; returns the canonical form.
+    try:
+        return str(uuid.UUID(value))
+    except (ValueError, TypeError, AttributeError):
+        raise InvalidQuery(error)
+
+
+def parse_fields(args, columns):
+    # ?fields=a,b,c selects a subset of the table's columns, returned in
+    # table order; id is always included. None means every column.
+    if columns is None or 'fields' not in args:
+        return None
+    requested = [name.strip() for name in args['fields'].split(',') if name.strip()]
+    if not requested:
+        raise InvalidQuery("fields must name at least one column")
+    unknown = [name for name in requested if name not in columns]
+    if unknown:
+        raise InvalidQuery(f"Unknown field(s): {', '.join(unknown)}")
+    return tuple(c for c in columns if c == 'id' or c in requested)
+
+
+def after_conditions(order_by, direction, at_null):
+    # PostgreSQL sorts NULLs last ascending and first descending, which is
+    # also the order of a (column, id) index. A row comparison against NULL is
+    # never true, so the rows after a cursor are split into their non-NULL and
+    # NULL runs; each is an index range scan, and two runs are UNION ALL'd.
+    if direction == 'asc':
+        if at_null:
+            return [f"{order_by} IS NULL AND id > :after_id"]
+        return [f"({order_by}, id) > (:after_value, :after_id)", f"{order_by} IS NULL"]
+    if at_null:
+        return [f"{order_by} IS NULL AND id < :after_id", f"{order_by} IS NOT NULL"]
+    return [f"({order_by}, id) < (:after_value, :after_id)"]
+
+
+def build_list_query(table, filters, sortable, args, paginate=True, time_column=None,
+                     columns=None, include=(), wrap=None):
+    # Keyset pagination: rows are ordered by (order_by, id) and the cursor
+    # carries the last row's pair, so each page is an index range scan
+    # instead of an OFFSET that re-reads everything before it.
+    limit = parse_limit(args) if paginate else None
+    order_by = args.get('order_by', 'id')
+    if order_by not in sortable:
+        raise InvalidQuery(f"Cannot order by '{order_by}'")
+    direction = args.get('order', 'asc').lower()
+    if direction not in ('asc', 'desc'):
+        raise InvalidQuery("order must be 'asc' or 'desc'")
+
+    where, params = [], {}
+    for column in filters:
+        if column in args:
+            value = args[column]
+            if column.endswith('_id'):
+                value = parse_uuid(value, f"{column} must be a UUID")
+            where.append(f"{column} = :f_{column}")
+            params[f"f_{column}"] = value
+
+    # from/to bound the time column; on partitioned tables this lets the
+    # planner skip every month outside the window.
+    if time_column is not None:
+        for name, op in (('from', '>='), ('to', '<')):
+            value = parse_timestamp(args.get(name), name)
+            if value is not None:
+                where.append(f"{time_column} {op} :{name}_time")
+                params[f"{name}_time"] = value
+
+    runs = [None]
+    if 'after' in args:
+        value, last_id = decode_cursor(args['after'])
+        params['after_id'] = last_id
+        if order_by == 'id':
+            where.append(f"id {'>' if direction == 'asc' else '<'} :after_id")
+        else:
+            runs = after_conditions(order_by, direction, value is None)
+            if value is not None:
+                # Every other sortable column is a timestamp or date.
+                try:
+                    parse_timestamp(value, order_by)
+                except (InvalidQuery, TypeError):
+                    raise InvalidQuery("Invalid cursor")
+                params['after_value'] = value
+
+    # A sparse fieldset is projected in SQL so unrequested (often wide text)
+    # columns are never read or sent; the sort column stays in for the cursor.
+    fields = parse_fields(args, columns)
+    if fields is not None:
+        fields += tuple(c for c in (order_by,) + tuple(include) if c not in fields)
+    if order_by == 'id':
+        order = f"id {direction}"
+    else:
+        order = f"{order_by} {direction}, id {direction}"
+    page = f" ORDER BY {order}" + (" LIMIT :limit" if paginate else "")
+    selects = []
+    for run in runs:
+        conditions = where + [run] if run else where
+        select = f"SELECT {', '.join(fields) if fields else '*'} FROM {table}"
+        if conditions:
+            select += " WHERE " + " AND ".join(conditions)
+        selects.append(select)
+    if len(selects) == 1:
+        sql = selects[0] + page
+    else:
+        sql = " UNION ALL ".join(f"({select}{page})" for select in selects) + page
+    if paginate:
+        params['limit'] = limit + 1
+    # wrap(sql, order) lets a caller build on the page, e.g. expand.py
+    # joining referenced rows onto it.
+    if wrap is not None:
+        sql = wrap(sql, order)
+    return text(sql), params, order_by, limit
+
+
+def paginated_list(table, filters=(), sortable=('id',), time_column=None, columns=None,
+                   include=(), wrap=None):
+    # ?stream=1 or Accept: application/x-ndjson exports every matching row
+    # through a server-side cursor instead of returning a single page.
+    stream = wants_stream()
+    try:
+        sql, params, order_by, limit = build_list_query(
+            table, filters, sortable, request.args, paginate=not stream,
+            time_column=time_column, columns=columns, include=include, wrap=wrap
+        )
+    except InvalidQuery as e:
+        return jsonify({"error": str(e)}), 400
+    if stream:
+        return stream_rows(sql, params)
+
+    rows = db.session.execute(sql, params).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(last._mapping[order_by], last.id)
+    return jsonify({"items": rows, "next_cursor": next_cursor})
@@ -0,0 +1,128 @@
+# backend/partitions.py
+from datetime import date
+
+from sqlalchemy import text
+
+# Tables range-partitioned by month (see migrations/0003) and their key column.
+PARTITIONED_TABLES = {
+    'patient_vitals': 'recorded_at',
+    'test_results': 'taken_at',
+}
+SCHEMA = 'humatrace'
+ARCHIVE_SCHEMA = 'humatrace_archive'
+# Scanning DEFAULT and moving a month out of it read every row there, far
+# past the request statement_timeout; like migrations, these transactions
+# run without one and with a bounded wait for the parent table's lock.
+TIMEOUTS_SQL = text(
+    "SELECT set_config('statement_timeout', '0', true), set_config('lock_timeout', :lock_timeout, true)"
+)
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table, month):
+    return f"{table}_{month:%Y_%m}"
+
+
+def is_partitioned(conn, table):
+    return conn.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {'name': f"{SCHEMA}.{table}_default"}
+    ).scalar()
+
+
+def monthly_partitions(conn, table):
+    rows = conn.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_namespace ns ON ns.oid = parent.relnamespace
+        WHERE ns.nspname = :schema AND parent.relname = :table
+    """), {'schema': SCHEMA, 'table': table})
+    months = {}
+    for (name,) in rows:
+        suffix = name[len(table) + 1:]
+        if suffix != 'default':
+            year, month = suffix.split('_')
+            months[date(int(year), int(month), 1)] = name
+    return months
+
+
+def create_partition(conn, table, column, month):
+    # Rows for this month may already sit in the DEFAULT partition (legacy
+    # data or late arrivals); move them before attaching, otherwise ATTACH
+    # fails on the overlapping range.
+    name = partition_name(table, month)
+    params = {'start': month, 'end': add_months(month, 1)}
+    conn.execute(text(
+        f"CREATE TABLE {SCHEMA}.{name} (LIKE {SCHEMA}.{table} INCLUDING DEFAULTS)"
+    ))
+    conn.execute(text(f"""
+        WITH moved AS (
+            DELETE FROM {SCHEMA}.{table}_default
+            WHERE {column} >= :start AND {column} < :end
+            RETURNING *
+        )
+        INSERT INTO {SCHEMA}.{name} SELECT * FROM moved
+    """), params)
+    conn.execute(text(
+        f"ALTER TABLE {SCHEMA}.{table} ATTACH PARTITION {SCHEMA}.{name} "
+        f"FOR VALUES FROM ('{params['start']}') TO ('{params['end']}')"
+    ))
+    return name
+
+
+def ensure_partitions(engine, months_ahead=3, today=None, lock_timeout_ms=0):
+    # Creates partitions for the current month, the next months_ahead months
+    # and every month that currently has rows in the DEFAULT partition.
+    current = month_start(today or date.today())
+    timeouts = {'lock_timeout': str(lock_timeout_ms)}
+    created = []
+    for table, column in PARTITIONED_TABLES.items():
+        with engine.begin() as conn:
+            if not is_partitioned(conn, table):
+                continue
+            conn.execute(TIMEOUTS_SQL, timeouts)
+            existing = monthly_partitions(conn, table)
+            wanted = {add_months(current, i) for i in range(months_ahead + 1)}
+            wanted.update(row[0] for row in conn.execute(text(
+                f"SELECT DISTINCT date_trunc('month', {column})::date "
+                f"FROM {SCHEMA}.{table}_default"
+            )))
+        for month in sorted(wanted - set(existing)):
+            with engine.begin() as conn:
+                conn.execute(TIMEOUTS_SQL, timeouts)
+                created.append(create_partition(conn, table, column, month))
+    return created
+
+
+def detach_expired(engine, retention_months, drop=False, today=None, lock_timeout_ms=0):
+    # Retention without row DELETEs: whole months older than the window are
+    # detached and either moved to the humatrace_archive schema or dropped.
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    timeouts = {'lock_timeout': str(lock_timeout_ms)}
+    detached = []
+    for table in PARTITIONED_TABLES:
+        with engine.begin() as conn:
+            if not is_partitioned(conn, table):
+                continue
+            expired = {m: n for m, n in monthly_partitions(conn, table).items() if m < cutoff}
+        for month, name in sorted(expired.items()):
+            with engine.begin() as conn:
+                conn.execute(TIMEOUTS_SQL, timeouts)
+                conn.execute(text(f"ALTER TABLE {SCHEMA}.{table} DETACH PARTITION {SCHEMA}.{name}"))
+                if drop:
+                    conn.execute(text(f"DROP TABLE {SCHEMA}.{name}"))
+                else:
+                    conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+                    conn.execute(text(f"ALTER TABLE {SCHEMA}.{name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+            detached.append(name)
+    return detached
@@ -0,0 +1,86 @@
+# backend/routes/changes.py
+
+import time
+
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
+from extensions import db
+from sqlalchemy import text
+
+changes_bp = Blueprint('changes_bp', __name__)
+
+CHANGES_DEFAULT_LIMIT = 500
+CHANGES_MAX_LIMIT = 5000
+SSE_MIMETYPE = 'text/event-stream'
+SSE_HEARTBEAT_SECONDS = 15
+
+RELAY_SQL = text("SELECT humatrace.relay_changes()")
+CHANGES_SQL = text("""
+    SELECT seq, table_name AS "table", op, row_id AS id, data, changed_at
+    FROM humatrace.change_log
+    WHERE seq > :since AND (CAST(:tables AS text[]) IS NULL OR table_name = ANY(CAST(:tables AS text[])))
+    ORDER BY seq
+    LIMIT :limit
+""")
+
+
+def fetch_changes(since, tables, limit):
+    # Numbers newly committed outbox rows, then reads past the cursor. Each
+    # call is its own transaction so a waiting client holds no connection
+    # between polls.
+    db.session.execute(RELAY_SQL)
+    db.session.commit()
+    rows = db.session.execute(CHANGES_SQL, {'since': since, 'tables': tables, 'limit': limit}).all()
+    db.session.commit()
+    return rows
+
+
+def parse_changes_args(args):
+    since = args.get('since', request.headers.get('Last-Event-ID', 0))
+    try:
+        since = int(since)
+        limit = max(1, min(int(args.get('limit', CHANGES_DEFAULT_LIMIT)), CHANGES_MAX_LIMIT))
+        wait = max(0.0, min(float(args.get('wait', 0)), current_app.config['CHANGES_MAX_WAIT']))
+    except ValueError:
+        raise ValueError("since and limit must be integers and wait a number of seconds")
+    tables = [t for t in args.get('tables', '').split(',') if t] or None
+    return since, tables, limit, wait
+
+
+def sse_stream(since, tables, limit, interval):
+    last_sent = time.monotonic()
+    while True:
+        rows = fetch_changes(since, tables, limit)
+        for row in rows:
+            since = row.seq
+            yield f"id: {row.seq}\nevent: change\ndata: {current_app.json.dumps(row)}\n\n"
+        if rows:
+            last_sent = time.monotonic()
+            continue
+        if time.monotonic() - last_sent >= SSE_HEARTBEAT_SECONDS:
+            last_sent = time.monotonic()
+            yield ": keep-alive\n\n"
+        time.sleep(interval)
+
+
+@changes_bp.route('', methods=['GET'])
+@changes_bp.route('/', methods=['GET'])
+def get_changes():
+    # ?since=<seq> returns changes with a higher seq, oldest first. wait=<s>
+    # long-polls until something arrives; Accept: text/event-stream streams
+    # them as server-sent events (resuming from Last-Event-ID).
+    try:
+        since, tables, limit, wait = parse_changes_args(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    interval = current_app.config['CHANGES_POLL_INTERVAL_MS'] / 1000
+
+    if SSE_MIMETYPE in request.accept_mimetypes.values():
+        return Response(stream_with_context(sse_stream(since, tables, limit, interval)),
+                        mimetype=SSE_MIMETYPE, headers={'Cache-Control': 'no-cache'})
+
+    deadline = time.monotonic() + wait
+    rows = fetch_changes(since, tables, limit)
+    while not rows and time.monotonic() < deadline:
+        time.sleep(interval)
+        rows = fetch_changes(since, tables, limit)
+    return jsonify({"changes": rows, "next_since": rows[-1].seq if rows else since})
@@ -1,81 +1,73 @@
-from flask import Blueprint, request, jsonify
-from extensions import db
-from sqlalchemy import text
-import uuid
+# backend/routes/doctor.py
 
-doctor_bp = Blueprint('doctor_bp', __name__)
+from flask import current_app, jsonify, request
+from availability import free_windows, parse_window, slot_starts
+from crud import Entity, is_uuid, make_blueprint
+from pagination import InvalidQuery
+from search import FULL_NAME, Search
 
-@doctor_bp.route('/', methods=['GET'])
-def get_doctors():
-    sql = text("SELECT * FROM humatrace.doctors")
-    result = db.session.execute(sql)
-    doctors = [dict(row) for row in result]
-    return jsonify(doctors)
+doctors = Entity(
+    name='doctor',
+    plural='doctors',
+    table="humatrace.doctors",
+    label="Doctor",
+    columns=('first_name', 'last_name', 'specialty', 'phone', 'email'),
+    filters=('specialty',),
+    sortable=('id',),
+    cached=True
+)
 
-@doctor_bp.route('/<string:id>', methods=['GET'])
-def get_doctor(id):
-    sql = text("SELECT * FROM humatrace.doctors WHERE id = :id")
-    result = db.session.execute(sql, {'id': id}).fetchone()
-    if not result:
-        return jsonify({"error": "Doctor not found"}), 404
-    return jsonify(dict(result))
+doctor_bp = make_blueprint('doctor_bp', doctors)
+
+doctor_search = Search(
+    doctors,
+    names=(FULL_NAME, "lower(coalesce(specialty, ''))")
+)
 
-@doctor_bp.route('/', methods=['POST'])
-def create_doctor():
-    data = request.json
-    new_id = str(uuid.uuid4())
-    sql = text("""
-        INSERT INTO humatrace.doctors (id, first_name, last_name, specialty, phone, email)
-        VALUES (:id, :first_name, :last_name, :specialty, :phone, :email)
-    """)
-    db.session.execute(sql, {
-        'id': new_id,
-        'first_name': data.get('first_name'),
-        'last_name': data.get('last_name'),
-        'specialty': data.get('specialty'),
-        'phone': data.get('phone'),
-        'email': data.get('email')
-    })
-    db.session.commit()
-    return jsonify({"message": "Doctor created", "id": new_id}), 201
 
-@doctor_bp.route('/<string:id>', methods=['PUT'])
-def update_doctor(id):
-    data = request.json
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.doctors WHERE id = :id"), {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Doctor not found"}), 404
+@doctor_bp.route('/search', methods=['GET'])
+def search_doctors():
+    return doctor_search.respond(request.args)
 
-    sql = text("""
-        UPDATE humatrace.doctors SET
-        first_name = :first_name,
-        last_name = :last_name,
-        specialty = :specialty,
-        phone = :phone,
-        email = :email
-        WHERE id = :id
-    """)
-    db.session.execute(sql, {
-        'id': id,
-        'first_name': data.get('first_name'),
-        'last_name': data.get('last_name'),
-        'specialty': data.get('specialty'),
-        'phone': data.get('phone'),
-        'email': data.get('email')
+
+@doctor_bp.route('/availability', methods=['GET'])
+def get_doctors_availability():
+    # Free windows for many doctors at once (?ids=a,b or ?specialty=), up to
+    # availability.MAX_DOCTORS per request.
+    try:
+        since, until, duration = parse_window(request.args)
+    except InvalidQuery as e:
+        return jsonify({"error": str(e)}), 400
+    ids = [i for i in request.args.get('ids', '').split(',') if is_uuid(i)] or None
+    windows = free_windows(since, until, duration, ids=ids, specialty=request.args.get('specialty'))
+    return jsonify({
+        "from": since,
+        "to": until,
+        "duration": duration,
+        "doctors": [{"doctor_id": doctor_id, "free": [{"start": start, "end": end} for start, end in free]}
+                    for doctor_id, free in windows.items()]
     })
-    db.session.commit()
-    return jsonify({"message": "Doctor updated"})
 
-@doctor_bp.route('/<string:id>', methods=['DELETE'])
-def delete_doctor(id):
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.doctors WHERE id = :id"), {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Doctor not found"}), 404
 
-    db.session.execute(text("DELETE FROM humatrace.doctors WHERE id = :id"), {'id': id})
-    db.session.commit()
-    return jsonify({"message": "Doctor deleted"})
+@doctor_bp.route('/<string:id>/availability', methods=['GET'])
+@doctors.by_id
+def get_doctor_availability(id):
+    # ?from=&to= (default: now and a week later), ?duration= minutes.
+    # Returns the free windows and the bookable start times on the slot grid.
+    try:
+        since, until, duration = parse_window(request.args)
+    except InvalidQuery as e:
+        return jsonify({"error": str(e)}), 400
+    windows = free_windows(since, until, duration, ids=[id])
+    if not windows:
+        return doctors.not_found()
+    free = windows.popitem()[1]
+    step = current_app.config['AVAILABILITY_SLOT_STEP']
+    return jsonify({
+        "doctor_id": id,
+        "from": since,
+        "to": until,
+        "duration": duration,
+        "free": [{"start": start, "end": end} for start, end in free],
+        "slots": slot_starts(free, duration, step)
+    })
@@ -0,0 +1,42 @@
+# backend/routes/health.py
+
+from flask import Blueprint, current_app, jsonify
+from extensions import db, cache
+from sqlalchemy import text
+from warmup import is_ready
+
+health_bp = Blueprint('health_bp', __name__)
+
+
+def pool_stats():
+    pool = db.engine.pool
+    stats = {'class': type(pool).__name__}
+    # Only QueuePool-style pools track these counters.
+    for key, attr in (('size', 'size'), ('checked_out', 'checkedout'),
+                      ('idle', 'checkedin'), ('overflow', 'overflow')):
+        if hasattr(pool, attr):
+            stats[key] = getattr(pool, attr)()
+    return stats
+
+
+@health_bp.route('/db', methods=['GET'])
+def health_db():
+    try:
+        db.session.execute(text("SELECT 1")).fetchone()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"status": "error", "error": str(e), "pool": pool_stats()}), 503
+    return jsonify({"status": "ok", "pool": pool_stats()})
+
+
+@health_bp.route('/cache', methods=['GET'])
+def health_cache():
+    return jsonify(cache.summary())
+
+
+@health_bp.route('/ready', methods=['GET'])
+def health_ready():
+    # Load balancers should route to this worker only once it is warm.
+    if not is_ready():
+        return jsonify({"status": "starting"}), 503
+    return jsonify({"status": "ready", "warmup": current_app.extensions['warmup']})
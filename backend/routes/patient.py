@@ -1,88 +1,109 @@
 # backend/routes/patient.py
 
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 from extensions import db
 from sqlalchemy import text
-import uuid
+from crud import Entity, make_blueprint
+from pagination import parse_timestamp
+from search import FULL_NAME, PHONE_DIGITS, Search
+from functools import lru_cache
 
-patient_bp = Blueprint('patient_bp', __name__)
+patients = Entity(
+    name='patient',
+    plural='patients',
+    table="humatrace.patients",
+    label="Patient",
+    columns=('first_name', 'last_name', 'gender', 'phone', 'date_of_birth'),
+    filters=('gender',),
+    sortable=('id',)
+)
 
-@patient_bp.route('/', methods=['GET'])
-def get_patients():
-    result = db.session.execute(text("SELECT * FROM humatrace.patients"))
-    patients = [dict(row) for row in result]
-    return jsonify(patients)
+patient_bp = make_blueprint('patient_bp', patients)
 
-@patient_bp.route('/<string:id>', methods=['GET'])
-def get_patient(id):
-    result = db.session.execute(
-        text("SELECT * FROM humatrace.patients WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if result is None:
-        return jsonify({"error": "Patient not found"}), 404
-    return jsonify(dict(result))
+patient_search = Search(
+    patients,
+    names=(FULL_NAME,),
+    phone=PHONE_DIGITS,
+    birth_date='date_of_birth'
+)
 
-@patient_bp.route('/', methods=['POST'])
-def create_patient():
-    data = request.json
-    new_id = str(uuid.uuid4())
-    sql = text("""
-        INSERT INTO humatrace.patients (id, first_name, last_name, gender, phone, date_of_birth)
-        VALUES (:id, :first_name, :last_name, :gender, :phone, :date_of_birth)
-    """)
-    db.session.execute(sql, {
-        'id': new_id,
-        'first_name': data.get('first_name'),
-        'last_name': data.get('last_name'),
-        'gender': data.get('gender'),
-        'phone': data.get('phone'),
-        'date_of_birth': data.get('date_of_birth')
-    })
-    db.session.commit()
-    return jsonify({"message": "Patient created", "id": new_id}), 201
 
-@patient_bp.route('/<string:id>', methods=['PUT'])
-def update_patient(id):
-    data = request.json
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.patients WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Patient not found"}), 404
+@patient_bp.route('/search', methods=['GET'])
+def search_patients():
+    return patient_search.respond(request.args)
 
-    sql = text("""
-        UPDATE humatrace.patients SET
-            first_name = :first_name,
-            last_name = :last_name,
-            gender = :gender,
-            phone = :phone,
-            date_of_birth = :date_of_birth
-        WHERE id = :id
-    """)
-    db.session.execute(sql, {
-        'id': id,
-        'first_name': data.get('first_name'),
-        'last_name': data.get('last_name'),
-        'gender': data.get('gender'),
-        'phone': data.get('phone'),
-        'date_of_birth': data.get('date_of_birth')
-    })
-    db.session.commit()
-    return jsonify({"message": "Patient updated"})
+# Patient-scoped sections of GET /patient/<id>/timeline: (table, time column)
+TIMELINE_SECTIONS = {
+    'vitals': ("humatrace.patient_vitals", 'recorded_at'),
+    'appointments': ("humatrace.appointments", 'scheduled_at'),
+    'sessions': ("humatrace.sessions", 'started_at'),
+    'diagnoses': ("humatrace.diagnoses", 'diagnosed_at'),
+    'treatments': ("humatrace.treatments", 'started_at'),
+    'medication_history': ("humatrace.medication_history", 'start_date'),
+    'test_results': ("humatrace.test_results", 'taken_at'),
+}
+TIMELINE_DEFAULT_LIMIT = 50
+TIMELINE_MAX_LIMIT = 500
 
-@patient_bp.route('/<string:id>', methods=['DELETE'])
-def delete_patient(id):
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.patients WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Patient not found"}), 404
-    db.session.execute(
-        text("DELETE FROM humatrace.patients WHERE id = :id"),
-        {'id': id}
-    )
-    db.session.commit()
-    return jsonify({"message": "Patient deleted"})
+
+@lru_cache(maxsize=None)
+def timeline_sql(sections, since, until):
+    # One round trip: every section is a json_agg over an indexed
+    # (patient_id, time) range, newest first, capped by its own limit.
+    # sections is a subset of TIMELINE_SECTIONS in its order and since/until
+    # only say whether a bound was given, so the cache stays small. Without
+    # bounds rows with no time are included (first, as DESC sorts NULLs).
+    parts = ["(SELECT row_to_json(p) FROM humatrace.patients p WHERE p.id = :id) AS patient"]
+    for section in sections:
+        table, column = TIMELINE_SECTIONS[section]
+        where = ["patient_id = :id"]
+        if since:
+            where.append(f"{column} >= :since")
+        if until:
+            where.append(f"{column} < :until")
+        parts.append(f"""(
+            SELECT COALESCE(json_agg(t ORDER BY t.{column} DESC), '[]'::json) FROM (
+                SELECT * FROM {table}
+                WHERE {' AND '.join(where)}
+                ORDER BY {column} DESC
+                LIMIT :{section}_limit
+            ) t
+        ) AS {section}""")
+    return text("SELECT " + ",\n".join(parts))
+
+
+def parse_section_limit(args, section):
+    value = args.get(f"{section}_limit", args.get('limit', TIMELINE_DEFAULT_LIMIT))
+    try:
+        return max(1, min(int(value), TIMELINE_MAX_LIMIT))
+    except ValueError:
+        raise ValueError(f"{section}_limit must be an integer")
+
+
+@patient_bp.route('/<string:id>/timeline', methods=['GET'])
+@patients.by_id
+def get_patient_timeline(id):
+    args = request.args
+    if 'sections' in args:
+        requested = {s for s in args['sections'].split(',') if s}
+        unknown = sorted(requested - TIMELINE_SECTIONS.keys())
+        if unknown:
+            return jsonify({"error": f"Unknown sections: {', '.join(unknown)}"}), 400
+        sections = tuple(s for s in TIMELINE_SECTIONS if s in requested)
+    else:
+        sections = tuple(TIMELINE_SECTIONS)
+
+    params = {'id': id}
+    try:
+        params['since'] = parse_timestamp(args.get('from'), 'from')
+        params['until'] = parse_timestamp(args.get('to'), 'to')
+        for section in sections:
+            params[f"{section}_limit"] = parse_section_limit(args, section)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    sql = timeline_sql(sections, params['since'] is not None, params['until'] is not None)
+    row = db.session.execute(sql, params).fetchone()
+    if row.patient is None:
+        return patients.not_found()
+    return jsonify(row)
@@ -1,93 +1,90 @@
 # backend/routes/patient_vitals.py
 
-from flask import Blueprint, request, jsonify
+from flask import request, jsonify
 from extensions import db
 from sqlalchemy import text
-import uuid
+from crud import Entity, is_uuid, make_blueprint
+from pagination import InvalidQuery, parse_timestamp
+from datetime import datetime
 
-patient_vitals_bp = Blueprint('patient_vitals_bp', __name__)
+patient_vitals = Entity(
+    name='patient_vital',
+    plural='patient_vitals',
+    table="humatrace.patient_vitals",
+    label="Patient vitals",
+    columns=('patient_id', 'height_cm', 'weight_kg', 'blood_pressure', 'temperature_celsius', 'recorded_at'),
+    filters=('patient_id',),
+    sortable=('id', 'recorded_at'),
+    time_column='recorded_at',
+    # recorded_at is the partition key (NOT NULL): default it on create and keep
+    # the stored value when a PUT omits it
+    insert_defaults={'recorded_at': datetime.utcnow},
+    update_keep=('recorded_at',),
+    references={
+        'patient': ('patient_id', "humatrace.patients")
+    }
+)
 
-@patient_vitals_bp.route('/', methods=['GET'])
-def get_patient_vitals():
-    result = db.session.execute(text("SELECT * FROM humatrace.patient_vitals"))
-    vitals = [dict(row) for row in result]
-    return jsonify(vitals)
+patient_vitals_bp = make_blueprint('patient_vitals_bp', patient_vitals)
 
-@patient_vitals_bp.route('/<string:id>', methods=['GET'])
-def get_patient_vital(id):
-    result = db.session.execute(
-        text("SELECT * FROM humatrace.patient_vitals WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if not result:
-        return jsonify({"error": "Patient vitals not found"}), 404
-    return jsonify(dict(result))
+# Measures kept in humatrace.patient_vitals_hourly (migrations/0004); systolic
+# and diastolic are parsed from blood_pressure.
+SERIES_MEASURES = ('height_cm', 'weight_kg', 'temperature_celsius', 'systolic', 'diastolic')
 
-@patient_vitals_bp.route('/', methods=['POST'])
-def create_patient_vital():
-    data = request.json
-    new_id = str(uuid.uuid4())
 
-    sql = text("""
-        INSERT INTO humatrace.patient_vitals
-        (id, patient_id, height_cm, weight_kg, blood_pressure, temperature_celsius, recorded_at)
-        VALUES (:id, :patient_id, :height_cm, :weight_kg, :blood_pressure, :temperature_celsius, :recorded_at)
-    """)
-    db.session.execute(sql, {
-        'id': new_id,
-        'patient_id': data.get('patient_id'),
-        'height_cm': data.get('height_cm'),
-        'weight_kg': data.get('weight_kg'),
-        'blood_pressure': data.get('blood_pressure'),
-        'temperature_celsius': data.get('temperature_celsius'),
-        'recorded_at': data.get('recorded_at')
-    })
-    db.session.commit()
-    return jsonify({"message": "Patient vitals created", "id": new_id}), 201
+def series_sql(bucket_expr, grouped):
+    columns = []
+    for m in SERIES_MEASURES:
+        if grouped:
+            columns += [f"min({m}_min) AS {m}_min", f"max({m}_max) AS {m}_max",
+                        f"sum({m}_sum) / NULLIF(sum({m}_count), 0) AS {m}_avg"]
+        else:
+            columns += [f"{m}_min", f"{m}_max", f"{m}_sum / NULLIF({m}_count, 0) AS {m}_avg"]
+    samples = "sum(samples) AS samples" if grouped else "samples"
+    sql = f"""
+        SELECT {bucket_expr} AS bucket, {samples}, {', '.join(columns)}
+        FROM humatrace.patient_vitals_hourly
+        WHERE patient_id = :patient_id
+          AND bucket >= COALESCE(CAST(:since AS timestamp), '-infinity')
+          AND bucket < COALESCE(CAST(:until AS timestamp), 'infinity')
+    """
+    if grouped:
+        sql += " GROUP BY 1"
+    return text(sql + " ORDER BY 1")
 
-@patient_vitals_bp.route('/<string:id>', methods=['PUT'])
-def update_patient_vital(id):
-    data = request.json
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.patient_vitals WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Patient vitals not found"}), 404
 
-    sql = text("""
-        UPDATE humatrace.patient_vitals SET
-            patient_id = :patient_id,
-            height_cm = :height_cm,
-            weight_kg = :weight_kg,
-            blood_pressure = :blood_pressure,
-            temperature_celsius = :temperature_celsius,
-            recorded_at = :recorded_at
-        WHERE id = :id
-    """)
-    db.session.execute(sql, {
-        'id': id,
-        'patient_id': data.get('patient_id'),
-        'height_cm': data.get('height_cm'),
-        'weight_kg': data.get('weight_kg'),
-        'blood_pressure': data.get('blood_pressure'),
-        'temperature_celsius': data.get('temperature_celsius'),
-        'recorded_at': data.get('recorded_at')
-    })
-    db.session.commit()
-    return jsonify({"message": "Patient vitals updated"})
+# 1h reads rollup rows as-is; 1d re-aggregates at most 24 of them per day.
+SERIES_SQL = {
+    '1h': series_sql("bucket", grouped=False),
+    '1d': series_sql("date_trunc('day', bucket)", grouped=True),
+}
+
 
-@patient_vitals_bp.route('/<string:id>', methods=['DELETE'])
-def delete_patient_vital(id):
-    exists = db.session.execute(
-        text("SELECT 1 FROM humatrace.patient_vitals WHERE id = :id"),
-        {'id': id}
-    ).fetchone()
-    if not exists:
-        return jsonify({"error": "Patient vitals not found"}), 404
-    db.session.execute(
-        text("DELETE FROM humatrace.patient_vitals WHERE id = :id"),
-        {'id': id}
-    )
-    db.session.commit()
-    return jsonify({"message": "Patient vitals deleted"})
+@patient_vitals_bp.route('/series', methods=['GET'])
+def get_patient_vitals_series():
+    args = request.args
+    patient_id = args.get('patient_id')
+    if not patient_id:
+        return jsonify({"error": "patient_id is required"}), 400
+    if not is_uuid(patient_id):
+        return jsonify({"error": "patient_id must be a UUID"}), 400
+    bucket = args.get('bucket', '1h')
+    if bucket not in SERIES_SQL:
+        return jsonify({"error": f"bucket must be one of {', '.join(SERIES_SQL)}"}), 400
+    try:
+        since = parse_timestamp(args.get('from'), 'from')
+        until = parse_timestamp(args.get('to'), 'to')
+    except InvalidQuery as e:
+        return jsonify({"error": str(e)}), 400
+
+    rows = db.session.execute(SERIES_SQL[bucket], {
+        'patient_id': patient_id, 'since': since, 'until': until
+    })
+    points = []
+    for row in rows:
+        values = row._mapping
+        point = {'bucket': row.bucket, 'samples': row.samples}
+        for m in SERIES_MEASURES:
+            point[m] = {'min': values[f"{m}_min"], 'max': values[f"{m}_max"], 'avg': values[f"{m}_avg"]}
+        points.append(point)
+    return jsonify({"patient_id": patient_id, "bucket": bucket, "points": points})
@@ -0,0 +1,19 @@
+# backend/routes/stats.py
+
+from flask import Blueprint, jsonify
+from conditional import etag_response
+from dashboard import read_snapshot
+
+stats_bp = Blueprint('stats_bp', __name__)
+stats_bp.after_request(etag_response)
+
+
+@stats_bp.route('/dashboard', methods=['GET'])
+def get_dashboard_stats():
+    # Served from the precomputed snapshot (migrations/0008); refreshed_at
+    # says how old the figures are.
+    snapshot = read_snapshot()
+    if snapshot is None:
+        return jsonify({"error": "Dashboard statistics have not been computed yet"}), 503
+    return jsonify(dict(snapshot.data, refreshed_at=snapshot.refreshed_at,
+                        refresh_duration_ms=snapshot.duration_ms))
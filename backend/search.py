@@ -0,0 +1,117 @@
+# backend/search.py
+import re
+from datetime import date
+from functools import lru_cache
+
+from flask import jsonify
+from sqlalchemy import text
+from extensions import db
+from pagination import InvalidQuery, parse_fields
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+SEARCH_MIN_LENGTH = 2
+
+# Indexed expressions; they must match migrations/0005_search.sql exactly or
+# the planner will not use the indexes.
+FULL_NAME = "lower(coalesce(first_name, '') || ' ' || coalesce(last_name, ''))"
+PHONE_DIGITS = "regexp_replace(coalesce(phone, ''), '\\D', '', 'g')"
+
+PARTIAL_DATE = re.compile(r'^(\d{4})(?:-(\d{1,2}))?$')
+
+
+def digits(q):
+    return re.sub(r'\D', '', q)
+
+
+def birth_date_range(q):
+    # 1990-05-15 -> that day, 1990-05 -> that month, 1990 -> that year.
+    try:
+        day = date.fromisoformat(q)
+        return day, date.fromordinal(day.toordinal() + 1)
+    except ValueError:
+        pass
+    match = PARTIAL_DATE.match(q)
+    if match is None:
+        return None
+    year, month = int(match.group(1)), match.group(2)
+    try:
+        if month is None:
+            return date(year, 1, 1), date(year + 1, 1, 1)
+        month = int(month)
+        return date(year, month, 1), date(year + month // 12, month % 12 + 1, 1)
+    except ValueError:
+        # Month 13, year 0 or a range ending after 9999, e.g. the phone
+        # fragment 0000: not a birth date, so that arm is skipped.
+        return None
+
+
+class Search:
+    # Ranked lookup over one table. Every arm of the WHERE clause is backed
+    # by an index, so the OR becomes a BitmapOr of index scans:
+    #   names      pg_trgm word similarity (prefix and typo tolerant)
+    #   fulltext   tsvector match ('simple' config, no stemming)
+    #   phone      digit substring via a trigram index
+    #   birth_date exact day / month / year range via btree
+
+    def __init__(self, entity, names=(), fulltext=None, phone=None, birth_date=None):
+        self.entity = entity
+        self.names = tuple(names)
+        self.fulltext = fulltext
+        self.phone = phone
+        self.birth_date = birth_date
+
+    def arms(self, q):
+        # Which optional arms apply depends on the shape of q.
+        arms = []
+        if self.phone and len(digits(q)) >= 3:
+            arms.append('phone')
+        if self.birth_date and birth_date_range(q) is not None:
+            arms.append('birth_date')
+        return tuple(arms)
+
+    @lru_cache(maxsize=None)
+    def sql(self, arms, fields):
+        where, scores = [], []
+        for expr in self.names:
+            where.append(f":q <% {expr}")
+            scores.append(f"word_similarity(:q, {expr}) + starts_with({expr}, :q)::int")
+        if self.fulltext:
+            where.append(f"{self.fulltext} @@ plainto_tsquery('simple', :q)")
+            scores.append(f"ts_rank({self.fulltext}, plainto_tsquery('simple', :q))")
+        if 'phone' in arms:
+            where.append(f"{self.phone} LIKE :phone_like")
+            scores.append(f"({self.phone} LIKE :phone_like)::int * 2")
+        if 'birth_date' in arms:
+            condition = f"({self.birth_date} >= :dob_from AND {self.birth_date} < :dob_to)"
+            where.append(condition)
+            scores.append(f"{condition}::int * 2")
+        score = f"GREATEST({', '.join(scores)})" if len(scores) > 1 else scores[0]
+        return text(
+            f"SELECT {', '.join(fields) if fields else '*'}, round(({score})::numeric, 3) AS score "
+            f"FROM {self.entity.table} "
+            f"WHERE {' OR '.join(where)} "
+            f"ORDER BY score DESC, id LIMIT :limit"
+        )
+
+    def respond(self, args):
+        q = ' '.join(args.get('q', '').lower().split())
+        if len(q) < SEARCH_MIN_LENGTH:
+            return jsonify({"error": f"q must be at least {SEARCH_MIN_LENGTH} characters"}), 400
+        try:
+            limit = max(1, min(int(args.get('limit', SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        try:
+            fields = parse_fields(args, self.entity.all_columns)
+        except InvalidQuery as e:
+            return jsonify({"error": str(e)}), 400
+
+        arms = self.arms(q)
+        params = {'q': q, 'limit': limit}
+        if 'phone' in arms:
+            params['phone_like'] = f"%{digits(q)}%"
+        if 'birth_date' in arms:
+            params['dob_from'], params['dob_to'] = birth_date_range(q)
+        rows = db.session.execute(self.sql(arms, fields), params).all()
+        return jsonify({"items": rows})
@@ -0,0 +1,55 @@
+# backend/streaming.py
+from flask import Response, current_app, request, stream_with_context
+from extensions import db
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+STREAM_BATCH_SIZE = 1000
+
+
+def wants_ndjson():
+    # Only an explicit Accept entry counts; */* keeps the plain JSON response.
+    return any(mimetype == NDJSON_MIMETYPE and quality > 0
+               for mimetype, quality in request.accept_mimetypes)
+
+
+def wants_stream():
+    return request.args.get('stream') in ('1', 'true') or wants_ndjson()
+
+
+def _iter_rows(sql, params):
+    # stream_results asks the driver for a server-side cursor, so only one
+    # batch of rows is held in Python memory at a time.
+    result = db.session.execute(
+        sql, params,
+        execution_options={'stream_results': True, 'yield_per': STREAM_BATCH_SIZE}
+    )
+    try:
+        for row in result:
+            yield row
+    finally:
+        result.close()
+
+
+def _ndjson(rows):
+    dumps = current_app.json.dumps
+    for row in rows:
+        yield dumps(row) + '\n'
+
+
+def _json_array(rows):
+    dumps = current_app.json.dumps
+    yield '['
+    first = True
+    for row in rows:
+        yield dumps(row) if first else ',' + dumps(row)
+        first = False
+    yield ']'
+
+
+def stream_rows(sql, params=None):
+    rows = _iter_rows(sql, params or {})
+    if wants_ndjson():
+        body, mimetype = _ndjson(rows), NDJSON_MIMETYPE
+    else:
+        body, mimetype = _json_array(rows), 'application/json'
+    return Response(stream_with_context(body), mimetype=mimetype)
@@ -0,0 +1,20 @@
+# backend/tests/conftest.py
+import pytest
+
+from app import create_app
+
+
+@pytest.fixture
+def app():
+    # The engine connects lazily and every request in these tests is answered
+    # before a query would run, so no database is needed.
+    return create_app({
+        'TESTING': True,
+        'BACKGROUND_TASKS': False,
+        'SQLALCHEMY_DATABASE_URI': 'postgresql+psycopg2://humatrace@localhost/humatrace_test',
+    })
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
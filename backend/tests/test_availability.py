@@ -0,0 +1,57 @@
+# backend/tests/test_availability.py
+import os
+from datetime import datetime
+
+import pytest
+
+from availability import APPOINTMENT_ACTIVE, parse_window, slot_starts
+from migrate import MIGRATIONS_DIR
+from pagination import InvalidQuery
+
+
+def test_slots_follow_the_grid_and_fit_the_window():
+    windows = [['2025-06-02T09:05:00', '2025-06-02T10:00:00'], ['2025-06-02T11:00:00', '2025-06-02T11:20:00']]
+    assert slot_starts(windows, 30, 15) == [
+        datetime(2025, 6, 2, 9, 15),
+        datetime(2025, 6, 2, 9, 30),
+    ]
+
+
+def test_no_slot_when_the_visit_does_not_fit():
+    assert slot_starts([['2025-06-02T09:00:00', '2025-06-02T09:20:00']], 30, 15) == []
+
+
+def test_parse_window_defaults():
+    since, until, duration = parse_window({'from': '2025-06-02T00:00:00'})
+    assert (until - since).days == 7
+    assert duration == 30
+
+
+@pytest.mark.parametrize('args', [
+    {'from': '2025-06-02T00:00:00', 'to': '2025-06-01T00:00:00'},
+    {'from': '2025-06-02T00:00:00', 'to': '2025-08-01T00:00:00'},
+    {'from': '2025-06-02T00:00:00', 'duration': '0'},
+    {'from': '2025-06-02T00:00:00', 'duration': 'long'},
+    {'from': 'yesterday'},
+])
+def test_parse_window_rejects(args):
+    with pytest.raises(InvalidQuery):
+        parse_window(args)
+
+
+def test_availability_and_the_constraint_agree_on_cancelled():
+    # Cancelled appointments must free the slot in both places.
+    with open(os.path.join(MIGRATIONS_DIR, '0007_appointment_slots.sql')) as f:
+        migration = f.read()
+    predicate = APPOINTMENT_ACTIVE.split(' AND ', 1)[1]
+    assert predicate == "lower(status) IS DISTINCT FROM 'cancelled'"
+    assert predicate in migration
+
+
+@pytest.mark.parametrize('url', [
+    '/doctor/availability?from=yesterday',
+    '/doctor/availability?duration=0',
+    '/doctor/6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f/availability?from=2025-06-02T00:00:00&to=2025-06-01T00:00:00',
+])
+def test_bad_windows_are_400(client, url):
+    assert client.get(url).status_code == 400
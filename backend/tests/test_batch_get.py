@@ -0,0 +1,34 @@
+# backend/tests/test_batch_get.py
+import pytest
+
+from crud import MAX_BATCH_IDS, parse_batch_ids
+
+
+@pytest.mark.parametrize('kwargs', [
+    {'json': ['a', 'b']},
+    {'json': 'a'},
+    {'json': {'ids': 'a'}},
+    {'json': {'ids': []}},
+    {'json': {'ids': ['a'] * (MAX_BATCH_IDS + 1)}},
+    {'data': 'not json', 'content_type': 'application/json'},
+])
+def test_batch_get_rejects_bad_bodies(client, kwargs):
+    response = client.post('/patient/batch_get', **kwargs)
+    assert response.status_code == 400
+    assert 'error' in response.json
+
+
+def test_parse_batch_ids_from_query(app):
+    with app.test_request_context('/patient/batch_get?ids=a,,b'):
+        assert parse_batch_ids() == ['a', 'b']
+    with app.test_request_context('/patient/batch_get'):
+        with pytest.raises(ValueError):
+            parse_batch_ids()
+
+
+def test_non_uuid_ids_are_misses_without_a_query(client):
+    # The conftest database URI is unreachable, so this only passes if no
+    # statement is executed.
+    response = client.get('/patient/batch_get?ids=a,b,a')
+    assert response.status_code == 200
+    assert response.json == {"items": [None, None, None], "missing": ['a', 'b', 'a']}
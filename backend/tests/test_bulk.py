@@ -0,0 +1,34 @@
+# backend/tests/test_bulk.py
+import uuid
+
+import pytest
+from sqlalchemy.sql.dml import Insert
+
+from crud import MAX_BULK_ITEMS
+from routes.appointment import appointments
+
+ID = str(uuid.uuid4())
+
+
+def test_insert_is_a_core_statement():
+    # text() inserts are not batched by insertmanyvalues; bulk create relies on it.
+    assert isinstance(appointments.insert_sql, Insert)
+
+
+def test_insert_params_defaults():
+    params = appointments.insert_params({'doctor_id': ID}, 'new-id')
+    assert params['id'] == 'new-id'
+    assert params['duration_minutes'] == 30
+    assert params['status'] is None
+
+
+@pytest.mark.parametrize('body', [{'first_name': 'Ada'}, [], [1]])
+def test_bulk_create_rejects_bad_bodies(client, body):
+    assert client.post('/patient/bulk', json=body).status_code == 400
+
+
+def test_bulk_create_caps_items(client):
+    body = [{'first_name': 'Ada'}] * (MAX_BULK_ITEMS + 1)
+    response = client.post('/patient/bulk', json=body)
+    assert response.status_code == 400
+    assert str(MAX_BULK_ITEMS) in response.json['error']
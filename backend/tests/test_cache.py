@@ -0,0 +1,116 @@
+# backend/tests/test_cache.py
+import fakeredis
+import pytest
+from flask import jsonify
+
+from cache import Cache, MemoryBackend, RedisBackend
+
+ID = '6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f'
+
+
+@pytest.fixture(params=['memory', 'redis'])
+def cache(request, app):
+    backend = MemoryBackend() if request.param == 'memory' else RedisBackend(fakeredis.FakeRedis())
+    cache = Cache()
+    cache.init_app(app, backend)
+    return cache
+
+
+def counting(body):
+    calls = []
+
+    def produce():
+        calls.append(1)
+        return jsonify(body)
+    return produce, calls
+
+
+def test_row_hit_and_invalidate(app, cache):
+    produce, calls = counting({'id': ID})
+    with app.test_request_context():
+        assert cache.cached_row('doctors', ID, produce).json == {'id': ID}
+        assert cache.cached_row('doctors', ID, produce).json == {'id': ID}
+        assert len(calls) == 1
+        cache.invalidate('doctors', ID)
+        cache.cached_row('doctors', ID, produce)
+        assert len(calls) == 2
+
+
+def test_row_keys_are_canonical(app, cache):
+    produce, calls = counting({'id': ID})
+    with app.test_request_context():
+        cache.cached_row('doctors', ID.upper(), produce)
+        cache.cached_row('doctors', ID.replace('-', ''), produce)
+        assert len(calls) == 1
+        cache.invalidate('doctors', ID.upper())
+        cache.cached_row('doctors', ID, produce)
+        assert len(calls) == 2
+
+
+def test_row_read_during_write_is_not_stored(app, cache):
+    # The read sees the old row, then a write commits and invalidates before
+    # the read gets to store it.
+    def produce():
+        cache.invalidate('doctors', ID)
+        return jsonify({'name': 'old'})
+
+    fresh, calls = counting({'name': 'new'})
+    with app.test_request_context():
+        assert cache.cached_row('doctors', ID, produce).json == {'name': 'old'}
+        assert cache.cached_row('doctors', ID, fresh).json == {'name': 'new'}
+        assert len(calls) == 1
+
+
+def test_list_keyed_by_generation(app, cache):
+    produce, calls = counting({'items': []})
+    with app.test_request_context('/doctor/?limit=5&order=asc'):
+        cache.cached_list('doctors', produce)
+        cache.cached_list('doctors', produce)
+        assert len(calls) == 1
+        cache.invalidate('doctors')
+        cache.cached_list('doctors', produce)
+        assert len(calls) == 2
+    with app.test_request_context('/doctor/?order=asc&limit=5'):
+        cache.cached_list('doctors', produce)
+        assert len(calls) == 2
+
+
+def test_errors_are_not_cached(app, cache):
+    calls = []
+
+    def produce():
+        calls.append(1)
+        return jsonify({"error": "Doctor not found"}), 404
+
+    with app.test_request_context():
+        assert cache.cached_row('doctors', ID, produce).status_code == 404
+        cache.cached_row('doctors', ID, produce)
+        assert len(calls) == 2
+        assert cache.summary()['tables']['doctors'] == {'hits': 0, 'misses': 2}
+
+
+def test_memory_backend_evicts_least_recent():
+    backend = MemoryBackend(max_entries=2)
+    backend.set('a', b'1', 60)
+    backend.set('b', b'2', 60)
+    backend.get('a')
+    backend.set('c', b'3', 60)
+    assert backend.get('b') is None
+    assert backend.get('a') == b'1'
+
+
+def test_memory_backend_expires():
+    backend = MemoryBackend()
+    backend.set('a', b'1', -1)
+    assert backend.get('a') is None
+
+
+def test_redis_backend_prefixes_keys():
+    client = fakeredis.FakeRedis()
+    backend = RedisBackend(client)
+    backend.set('doctors:row:x', b'{}', 60)
+    backend.bump_generation('doctors')
+    assert client.get('humatrace:doctors:row:x') == b'{}'
+    assert 0 < client.ttl('humatrace:doctors:row:x') <= 60
+    assert backend.generation('doctors') == 1
+    assert backend.generation('issues') == 0
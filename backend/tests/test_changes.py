@@ -0,0 +1,73 @@
+# backend/tests/test_changes.py
+import pytest
+from flask import request
+from sqlalchemy import create_engine, text
+
+from routes import changes
+
+
+@pytest.fixture
+def feed(app, monkeypatch):
+    # fetch_changes answers from a queue of batches instead of the database;
+    # once the queue is empty every poll comes back empty.
+    app.config.update(CHANGES_POLL_INTERVAL_MS=1, CHANGES_MAX_WAIT=1)
+    batches, calls = [], []
+
+    def fetch_changes(since, tables, limit):
+        calls.append((since, tables, limit))
+        return batches.pop(0) if batches else []
+
+    monkeypatch.setattr(changes, 'fetch_changes', fetch_changes)
+    return batches, calls
+
+
+def change_rows(*seqs):
+    with create_engine('sqlite://').connect() as conn:
+        return [conn.execute(text("SELECT :seq AS seq, 'humatrace.patients' AS \"table\", 'insert' AS op"),
+                             {'seq': seq}).one() for seq in seqs]
+
+
+def test_parse_changes_args(app):
+    with app.test_request_context('/changes?since=7&limit=99999&wait=600&tables=a,,b'):
+        assert changes.parse_changes_args(request.args) == (7, ['a', 'b'], changes.CHANGES_MAX_LIMIT, 30)
+    with app.test_request_context('/changes', headers={'Last-Event-ID': '12'}):
+        assert changes.parse_changes_args(request.args) == (12, None, changes.CHANGES_DEFAULT_LIMIT, 0)
+
+
+@pytest.mark.parametrize('query', ['since=x', 'limit=1.5', 'wait=soon'])
+def test_bad_args_are_400(client, query):
+    assert client.get(f'/changes?{query}').status_code == 400
+
+
+def test_without_wait_polls_once(client, feed):
+    batches, calls = feed
+    response = client.get('/changes?since=5')
+    assert response.json == {"changes": [], "next_since": 5}
+    assert len(calls) == 1
+
+
+def test_wait_returns_as_soon_as_changes_arrive(client, feed):
+    batches, calls = feed
+    batches.extend([[], [], change_rows(6, 7)])
+    response = client.get('/changes?since=5&wait=1&tables=humatrace.patients')
+    assert response.json['next_since'] == 7
+    assert [c['seq'] for c in response.json['changes']] == [6, 7]
+    assert calls == [(5, ['humatrace.patients'], changes.CHANGES_DEFAULT_LIMIT)] * 3
+
+
+def test_empty_wait_ends_at_the_deadline(client, feed):
+    batches, calls = feed
+    response = client.get('/changes?since=5&wait=0.05')
+    assert response.json == {"changes": [], "next_since": 5}
+    assert len(calls) > 1
+
+
+def test_event_stream_resumes_from_last_event_id(client, feed):
+    batches, calls = feed
+    batches.append(change_rows(13))
+    response = client.get('/changes', headers={'Accept': 'text/event-stream', 'Last-Event-ID': '12'})
+    assert response.mimetype == 'text/event-stream'
+    event = next(response.response)
+    assert event.startswith(b"id: 13\nevent: change\ndata: {")
+    assert calls[0][0] == 12
+    response.close()
@@ -0,0 +1,50 @@
+# backend/tests/test_conditional.py
+from flask import Response, jsonify
+
+from conditional import etag_response
+
+
+def tagged(app, body=None, headers=None, method='GET'):
+    with app.test_request_context(method=method, headers=headers or {}):
+        return etag_response(jsonify(body or {'items': []}))
+
+
+def test_weak_etag_over_the_body(app):
+    first = tagged(app)
+    etag, weak = first.get_etag()
+    assert weak and etag
+    assert tagged(app).get_etag() == (etag, True)
+    assert tagged(app, {'items': [1]}).get_etag()[0] != etag
+
+
+def test_matching_if_none_match_is_304(app):
+    app.add_url_rule('/tagged', 'tagged', lambda: etag_response(jsonify({'items': []})))
+    client = app.test_client()
+    etag = client.get('/tagged').headers['ETag']
+    response = client.get('/tagged', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+
+def test_stale_if_none_match_is_200(app):
+    etag = tagged(app).headers['ETag']
+    response = tagged(app, {'items': [1]}, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json == {'items': [1]}
+
+
+def test_only_successful_gets_are_tagged(app):
+    assert 'ETag' not in tagged(app, method='POST').headers
+    with app.test_request_context():
+        response = jsonify({"error": "Patient not found"})
+        response.status_code = 404
+        assert 'ETag' not in etag_response(response).headers
+        streamed = Response(iter([b'{}\n']), mimetype='application/x-ndjson')
+        assert 'ETag' not in etag_response(streamed).headers
+
+
+def test_every_read_blueprint_is_tagged(app):
+    tagged_blueprints = {name for name, funcs in app.after_request_funcs.items() if etag_response in funcs}
+    entities = {name for name, bp in app.blueprints.items() if getattr(bp, 'entity', None)}
+    assert entities | {'stats_bp'} <= tagged_blueprints
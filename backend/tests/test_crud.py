@@ -0,0 +1,43 @@
+# backend/tests/test_crud.py
+import pytest
+
+
+def test_every_blueprint_keeps_the_handler_endpoint_names(app):
+    # Endpoint names match the hand-written handlers the engine replaced.
+    entities = [bp.entity for bp in app.blueprints.values() if getattr(bp, 'entity', None)]
+    assert len(entities) == 13
+    for entity in entities:
+        bp = next(name for name, bp in app.blueprints.items() if getattr(bp, 'entity', None) is entity)
+        expected = {
+            f"get_{entity.plural}": {'GET'},
+            f"get_{entity.name}": {'GET'},
+            f"batch_get_{entity.plural}": {'GET', 'POST'},
+            f"create_{entity.name}": {'POST'},
+            f"bulk_create_{entity.plural}": {'POST'},
+            f"update_{entity.name}": {'PUT'},
+            f"patch_{entity.name}": {'PATCH'},
+            f"delete_{entity.name}": {'DELETE'},
+        }
+        for endpoint, methods in expected.items():
+            rules = [r for r in app.url_map.iter_rules() if r.endpoint == f"{bp}.{endpoint}"]
+            assert len(rules) == 1, endpoint
+            assert methods <= rules[0].methods
+
+
+@pytest.mark.parametrize('method, path', [
+    ('get', '/patient/not-a-uuid'),
+    ('put', '/patient/not-a-uuid'),
+    ('patch', '/patient/not-a-uuid'),
+    ('delete', '/patient/not-a-uuid'),
+    ('get', '/doctor/not-a-uuid'),
+    ('get', '/patient/not-a-uuid/timeline'),
+    ('get', '/doctor/not-a-uuid/availability'),
+])
+def test_non_uuid_id_is_not_found(client, method, path):
+    response = getattr(client, method)(path, json={'phone': '555'})
+    assert response.status_code == 404
+    assert response.json['error'].endswith("not found")
+
+
+def test_series_requires_uuid_patient(client):
+    assert client.get('/patient_vitals/series?patient_id=42').status_code == 400
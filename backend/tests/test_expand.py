@@ -0,0 +1,46 @@
+# backend/tests/test_expand.py
+import pytest
+
+from crud import read_options
+from expand import expand_sql, expansion, parse_expand
+from pagination import InvalidQuery
+from routes.appointment import appointments
+from routes.treatment import treatments
+
+
+def test_parse_expand():
+    assert parse_expand({}, appointments) is None
+    assert parse_expand({'expand': ','}, appointments) is None
+    assert parse_expand({'expand': 'doctor, patient'}, appointments) == {'doctor': {}, 'patient': {}}
+    assert parse_expand({'expand': 'diagnosis.issue,diagnosis.patient'}, treatments) == {
+        'diagnosis': {'issue': {}, 'patient': {}}
+    }
+
+
+@pytest.mark.parametrize('expand', ['nurse', 'doctor.issue', 'diagnosis.patient.doctor'])
+def test_parse_expand_rejects(expand):
+    entity = treatments if expand.startswith('diagnosis') else appointments
+    with pytest.raises(InvalidQuery):
+        parse_expand({'expand': expand}, entity)
+
+
+def test_expand_sql_joins_by_primary_key():
+    sql = expand_sql(treatments, {'diagnosis': {'issue': {}}}, "SELECT * FROM humatrace.treatments LIMIT 5", 't.id')
+    assert sql.startswith("SELECT t.*, CASE WHEN e1.id IS NULL THEN NULL "
+                          "ELSE to_jsonb(e1) || jsonb_build_object('issue', row_to_json(e2)) END AS diagnosis "
+                          "FROM (SELECT * FROM humatrace.treatments LIMIT 5) t ")
+    assert "LEFT JOIN humatrace.diagnoses e1 ON e1.id = t.diagnosis_id" in sql
+    assert "LEFT JOIN humatrace.issues e2 ON e2.id = e1.issue_id" in sql
+    assert sql.endswith(" ORDER BY t.id")
+
+
+def test_expansion_keeps_foreign_keys():
+    assert expansion(appointments, None) == {}
+    assert expansion(appointments, {'doctor': {}, 'patient': {}})['include'] == ('doctor_id', 'patient_id')
+
+
+def test_fields_keep_expanded_keys(app):
+    with app.test_request_context('/?fields=status&expand=doctor'):
+        fields, tree = read_options(appointments)
+    assert tree == {'doctor': {}}
+    assert 'doctor_id' in fields and 'status' in fields
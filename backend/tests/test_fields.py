@@ -0,0 +1,33 @@
+# backend/tests/test_fields.py
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from pagination import InvalidQuery, build_list_query, parse_fields
+
+COLUMNS = ('id', 'patient_id', 'scheduled_at', 'status')
+
+
+def list_query(**args):
+    return build_list_query("humatrace.appointments", ('status',), ('id', 'scheduled_at'),
+                            MultiDict(args), columns=COLUMNS)
+
+
+def test_parse_fields():
+    assert parse_fields({}, COLUMNS) is None
+    # Table order, id always included.
+    assert parse_fields({'fields': 'status, patient_id'}, COLUMNS) == ('id', 'patient_id', 'status')
+    with pytest.raises(InvalidQuery):
+        parse_fields({'fields': 'status,secret'}, COLUMNS)
+    with pytest.raises(InvalidQuery):
+        parse_fields({'fields': ' , '}, COLUMNS)
+
+
+def test_sparse_fields_keep_sort_column():
+    sql, *_ = list_query(fields='status', order_by='scheduled_at')
+    assert sql.text.startswith("SELECT id, status, scheduled_at FROM")
+
+
+def test_unknown_field_is_400(client):
+    response = client.get('/appointment/6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f?fields=status,secret')
+    assert response.status_code == 400
+    assert response.json == {"error": "Unknown field(s): secret"}
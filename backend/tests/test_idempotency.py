@@ -0,0 +1,104 @@
+# backend/tests/test_idempotency.py
+import hashlib
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import idempotency
+from extensions import db
+
+BODY = {'first_name': 'Ada'}
+
+
+class FakeKeys:
+    # Stands in for humatrace.idempotency_keys behind db.session: claims,
+    # lookups and records go to a dict; the entity INSERT is ignored.
+    def __init__(self):
+        self.rows = {}
+        self.statements = []
+
+    def execute(self, statement, params=None):
+        self.statements.append(statement)
+        if statement is idempotency.CLAIM_SQL:
+            key = (params['endpoint'], params['key'])
+            if key in self.rows:
+                return SimpleNamespace(first=lambda: None)
+            self.rows[key] = SimpleNamespace(fingerprint=params['fingerprint'], status=None, body=None, ttl=60.0)
+        elif statement is idempotency.LOOKUP_SQL:
+            return SimpleNamespace(first=lambda: self.rows.get((params['endpoint'], params['key'])))
+        elif statement is idempotency.RECORD_SQL:
+            row = self.rows[(params['endpoint'], params['key'])]
+            row.status, row.body = params['status'], params['body']
+        return SimpleNamespace(first=lambda: 1)
+
+    def commit(self):
+        pass
+
+    rollback = commit
+
+
+@pytest.fixture
+def keys(app, monkeypatch):
+    fake = FakeKeys()
+    for name in ('execute', 'commit', 'rollback'):
+        monkeypatch.setattr(db.session, name, getattr(fake, name))
+    return fake
+
+
+def fingerprint(body):
+    return hashlib.blake2b(json.dumps(body).encode(), digest_size=16).digest()
+
+
+def post(client, body=BODY, key='retry-1'):
+    return client.post('/patient/', data=json.dumps(body), content_type='application/json',
+                       headers={'Idempotency-Key': key})
+
+
+def test_idempotency_key_length(client):
+    response = client.post('/patient/bulk', json=[BODY], headers={'Idempotency-Key': 'k' * 256})
+    assert response.status_code == 400
+
+
+def test_claim_records_the_response(client, keys):
+    response = post(client)
+    assert response.status_code == 201
+    assert 'Idempotent-Replayed' not in response.headers
+    (row,) = keys.rows.values()
+    assert row.status == 201 and json.loads(row.body) == response.json
+    assert row.fingerprint == fingerprint(BODY)
+
+
+def test_retry_replays_the_stored_response(app, client, keys):
+    first = post(client)
+    retry = post(client)
+    assert retry.status_code == 201
+    assert retry.headers['Idempotent-Replayed'] == 'true'
+    assert retry.json == first.json
+    assert keys.statements.count(idempotency.LOOKUP_SQL) == 1
+
+    # The replay is kept in process, so the next retry skips the table.
+    again = post(client)
+    assert again.json == first.json
+    assert keys.statements.count(idempotency.LOOKUP_SQL) == 1
+    assert app.extensions['idempotency'].get('patient_bp.create_patient:retry-1') is not None
+
+
+def test_reused_key_with_another_body_is_422(client, keys):
+    post(client)
+    assert post(client, {'first_name': 'Grace'}).status_code == 422
+
+
+def test_key_still_in_flight_is_409(client, keys):
+    keys.rows[('patient_bp.create_patient', 'retry-1')] = SimpleNamespace(
+        fingerprint=b'', status=None, body=None, ttl=60.0)
+    assert post(client).status_code == 409
+
+
+def test_recent_responses_replay_without_a_query(app, client):
+    app.extensions['idempotency'].set('patient_bp.create_patient:retry-1',
+                                      (fingerprint(BODY), 201, b'{"id":"x"}'), 60)
+    response = post(client)
+    assert response.status_code == 201
+    assert response.json == {'id': 'x'}
+    assert response.headers['Idempotent-Replayed'] == 'true'
@@ -0,0 +1,60 @@
+# backend/tests/test_json_provider.py
+import uuid
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import create_engine, text
+
+import json_provider
+
+ID = uuid.UUID('6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f')
+PAYLOAD = {
+    'id': ID,
+    'weight_kg': Decimal('70.25'),
+    'recorded_at': datetime(2025, 6, 2, 9, 30, 15, 250000),
+    'changed_at': datetime(2025, 6, 2, 9, 30, tzinfo=timezone.utc),
+    'date_of_birth': date(1990, 5, 15),
+    'opens': time(9, 0),
+    'notes': 'Zoë — 体温',
+    'missing': None,
+    'items': [1, 2.5, True],
+}
+EXPECTED = (
+    '{"id":"6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f","weight_kg":70.25,'
+    '"recorded_at":"2025-06-02T09:30:15.250000","changed_at":"2025-06-02T09:30:00+00:00",'
+    '"date_of_birth":"1990-05-15","opens":"09:00:00","notes":"Zoë — 体温","missing":null,'
+    '"items":[1,2.5,true]}\n'
+)
+
+
+@pytest.fixture(params=['orjson', 'stdlib'])
+def provider(request, app, monkeypatch):
+    if request.param == 'stdlib':
+        monkeypatch.setattr(json_provider, 'orjson', None)
+    elif json_provider.orjson is None:
+        pytest.skip("orjson is not installed")
+    return app.json
+
+
+def test_both_encoders_emit_the_same_body(app, provider):
+    with app.app_context():
+        assert provider.response(PAYLOAD).get_data(as_text=True) == EXPECTED
+
+
+def test_rows_serialize_as_objects(app, provider):
+    with create_engine('sqlite://').connect() as conn:
+        row = conn.execute(text("SELECT 1 AS a, 'x' AS b")).one()
+    with app.app_context():
+        assert provider.response({'items': [row]}).get_data(as_text=True) == '{"items":[{"a":1,"b":"x"}]}\n'
+
+
+def test_dumps_and_loads_round_trip(provider):
+    body = provider.dumps({'id': ID, 'n': Decimal('1.5')})
+    assert body == '{"id":"6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f","n":1.5}'
+    assert provider.loads(body) == {'id': str(ID), 'n': 1.5}
+
+
+def test_unknown_types_are_rejected(provider):
+    with pytest.raises(TypeError):
+        provider.dumps({'value': object()})
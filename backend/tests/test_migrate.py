@@ -0,0 +1,91 @@
+# backend/tests/test_migrate.py
+import hashlib
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+import migrate
+
+
+@pytest.fixture
+def migrations_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrate, 'MIGRATIONS_DIR', str(tmp_path))
+    (tmp_path / '0002_indexes.sql').write_text(
+        "CREATE INDEX IF NOT EXISTS a_idx ON t (a);\n"
+        "CREATE UNIQUE INDEX CONCURRENTLY b_idx ON t (b);\n"
+        "create index c_idx on t (c);\n"
+    )
+    (tmp_path / '0001_schema.sql').write_text("CREATE TABLE t (a int, b int, c int);\n")
+    (tmp_path / 'README.md').write_text("not a migration")
+    (tmp_path / '3_bad_name.sql').write_text("SELECT 1;")
+    return tmp_path
+
+
+class FakeEngine:
+    # Answers the queries status() and upgrade() make and records the rest.
+    def __init__(self, applied, indexes=()):
+        self.applied = applied
+        self.indexes = indexes
+        self.connection = self
+        self.executed = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    @contextmanager
+    def cursor(self):
+        yield SimpleNamespace(execute=lambda sql, params=None: self.executed.append((sql, params)))
+
+    def exec_driver_sql(self, sql):
+        pass
+
+    def execute(self, statement, params=None):
+        if statement.text.startswith("SELECT version"):
+            return [SimpleNamespace(version=v, checksum=c) for v, c in self.applied.items()]
+        if statement.text.startswith("INSERT"):
+            self.executed.append(('recorded', params['version']))
+            return None
+        return [SimpleNamespace(indexname=name) for name in self.indexes]
+
+
+def test_discover_orders_by_version(migrations_dir):
+    found = migrate.discover()
+    assert [(m.version, m.name) for m in found] == [(1, 'schema'), (2, 'indexes')]
+
+
+def test_checksum_and_index_names(migrations_dir):
+    schema, indexes = migrate.discover()
+    assert schema.checksum == hashlib.sha256((migrations_dir / '0001_schema.sql').read_bytes()).hexdigest()
+    assert schema.index_names() == []
+    assert indexes.index_names() == ['a_idx', 'b_idx', 'c_idx']
+
+
+def test_status_reports_pending_modified_and_missing(migrations_dir):
+    schema, indexes = migrate.discover()
+    report = migrate.status(FakeEngine({1: schema.checksum}, []))
+    assert [m.version for m in report['applied']] == [1]
+    assert [m.version for m in report['pending']] == [2]
+    assert report['modified'] == [] and report['missing_indexes'] == []
+
+    report = migrate.status(FakeEngine({1: 'edited', 2: indexes.checksum}, ['a_idx', 'c_idx']))
+    assert report['pending'] == []
+    assert [m.version for m in report['modified']] == [1]
+    assert report['missing_indexes'] == ['b_idx']
+
+
+def test_shipped_migrations_have_unique_versions():
+    versions = [m.version for m in migrate.discover()]
+    assert versions and versions == sorted(set(versions))
+
+
+def test_upgrade_applies_pending_without_statement_timeout(migrations_dir):
+    schema, indexes = migrate.discover()
+    engine = FakeEngine({1: schema.checksum})
+    assert [m.version for m in migrate.upgrade(engine, 5000)] == [2]
+    assert engine.executed == [
+        (migrate.TIMEOUTS_SQL, (5000,)),
+        (indexes.sql, None),
+        ('recorded', 2),
+    ]
@@ -0,0 +1,101 @@
+# backend/tests/test_pagination.py
+import base64
+
+import pytest
+from werkzeug.datastructures import MultiDict
+
+from pagination import InvalidQuery, build_list_query, decode_cursor, encode_cursor, parse_limit
+
+ID = '6f1c2a9e-0d4b-4d7e-9a51-2b8f3c4d5e6f'
+COLUMNS = ('id', 'patient_id', 'scheduled_at', 'status')
+
+
+def list_query(**args):
+    return build_list_query("humatrace.appointments", ('status',), ('id', 'scheduled_at'),
+                            MultiDict(args), columns=COLUMNS)
+
+
+@pytest.mark.parametrize('value', ['2025-06-02 09:00:00', None, 42])
+def test_cursor_round_trip(value):
+    assert decode_cursor(encode_cursor(value, ID)) == (value, ID)
+
+
+def raw_cursor(payload):
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+@pytest.mark.parametrize('cursor', [
+    'not a cursor!',
+    raw_cursor('{"a": 1}'),
+    raw_cursor('{"a": 1, "b": 2}'),
+    raw_cursor(f'[1, 2, "{ID}"]'),
+    raw_cursor('["2025-06-02", "not-a-uuid"]'),
+    raw_cursor('["2025-06-02", 7]'),
+    raw_cursor(f'[[1], "{ID}"]'),
+    raw_cursor(f'[true, "{ID}"]'),
+])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidQuery, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.mark.parametrize('value', ['yesterday', 42])
+def test_cursor_value_must_be_a_timestamp(value):
+    with pytest.raises(InvalidQuery, match="Invalid cursor"):
+        list_query(order_by='scheduled_at', after=encode_cursor(value, ID))
+
+
+def test_uuid_filters():
+    def query(**args):
+        return build_list_query("humatrace.appointments", ('patient_id',), ('id',), MultiDict(args))
+    _, params, _, _ = query(patient_id=ID.upper())
+    assert params['f_patient_id'] == ID
+    with pytest.raises(InvalidQuery, match="patient_id must be a UUID"):
+        query(patient_id='abc')
+
+
+def test_parse_limit_clamps():
+    assert parse_limit({}) == 100
+    assert parse_limit({'limit': '0'}) == 1
+    assert parse_limit({'limit': '5000'}) == 1000
+    with pytest.raises(InvalidQuery):
+        parse_limit({'limit': 'ten'})
+
+
+def test_list_query_rejects_unknown_order():
+    with pytest.raises(InvalidQuery):
+        list_query(order_by='status')
+    with pytest.raises(InvalidQuery):
+        list_query(order='sideways')
+
+
+def test_list_query_filters_and_limit():
+    sql, params, order_by, limit = list_query(status='Scheduled', limit='10')
+    assert "status = :f_status" in sql.text
+    assert sql.text.endswith("ORDER BY id asc LIMIT :limit")
+    assert params == {'f_status': 'Scheduled', 'limit': 11}
+    assert (order_by, limit) == ('id', 10)
+
+
+# NULLs sort last ascending and first descending, so depending on where the
+# cursor is, the rest of the walk is one run or a non-NULL and a NULL run.
+@pytest.mark.parametrize('order, value, runs, conditions', [
+    ('asc', '2025-06-02 09:00:00', 2, ["(scheduled_at, id) > (:after_value, :after_id)", "scheduled_at IS NULL"]),
+    ('asc', None, 1, ["scheduled_at IS NULL AND id > :after_id"]),
+    ('desc', '2025-06-02 09:00:00', 1, ["(scheduled_at, id) < (:after_value, :after_id)"]),
+    ('desc', None, 2, ["scheduled_at IS NULL AND id < :after_id", "scheduled_at IS NOT NULL"]),
+])
+def test_cursor_on_nullable_sort_column(order, value, runs, conditions):
+    sql, params, _, _ = list_query(order_by='scheduled_at', order=order, after=encode_cursor(value, ID))
+    assert sql.text.count("SELECT") == runs
+    assert ("UNION ALL" in sql.text) == (runs == 2)
+    for condition in conditions:
+        assert condition in sql.text
+    assert params['after_id'] == ID
+    assert params.get('after_value') == value
+
+
+def test_cursor_on_id():
+    sql, params, _, _ = list_query(order='desc', after=encode_cursor(ID, ID))
+    assert "id < :after_id" in sql.text
+    assert "UNION" not in sql.text
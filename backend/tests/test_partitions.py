@@ -0,0 +1,88 @@
+# backend/tests/test_partitions.py
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+import partitions
+from partitions import add_months, month_start, partition_name
+
+
+class FakeResult(list):
+    def scalar(self):
+        return self[0][0]
+
+
+class FakeEngine:
+    # One patient_vitals/test_results layout: existing monthly partitions and
+    # the months that still have rows in DEFAULT. Records every other statement.
+    def __init__(self, months, default_months=()):
+        self.months = months
+        self.default_months = default_months
+        self.executed = []
+
+    @contextmanager
+    def begin(self):
+        yield self
+
+    def execute(self, statement, params=None):
+        sql = ' '.join(statement.text.split())
+        if sql.startswith("SELECT to_regclass"):
+            return FakeResult([(params['name'] == 'humatrace.patient_vitals_default',)])
+        if 'FROM pg_inherits' in sql:
+            return FakeResult([(partition_name(params['table'], m),) for m in self.months]
+                              + [(f"{params['table']}_default",)])
+        if sql.startswith("SELECT DISTINCT"):
+            return FakeResult([(m,) for m in self.default_months])
+        self.executed.append((sql, params))
+        return FakeResult()
+
+    def statements(self, prefix):
+        return [(sql, params) for sql, params in self.executed if sql.startswith(prefix)]
+
+
+@pytest.mark.parametrize('month, count, expected', [
+    (date(2025, 1, 1), 1, date(2025, 2, 1)),
+    (date(2025, 11, 1), 3, date(2026, 2, 1)),
+    (date(2025, 1, 1), -1, date(2024, 12, 1)),
+    (date(2025, 3, 1), -27, date(2022, 12, 1)),
+    (date(2025, 12, 1), 0, date(2025, 12, 1)),
+])
+def test_add_months(month, count, expected):
+    assert add_months(month, count) == expected
+
+
+def test_month_start_and_partition_name():
+    assert month_start(date(2024, 2, 29)) == date(2024, 2, 1)
+    assert partition_name('patient_vitals', date(2025, 3, 1)) == 'patient_vitals_2025_03'
+
+
+def test_ensure_partitions_covers_ahead_and_default_months():
+    engine = FakeEngine([date(2025, 6, 1)], default_months=[date(2024, 11, 1), date(2025, 6, 1)])
+    created = partitions.ensure_partitions(engine, 2, today=date(2025, 6, 17), lock_timeout_ms=5000)
+    # test_results is not partitioned in this layout, so only vitals months.
+    assert created == ['patient_vitals_2024_11', 'patient_vitals_2025_07', 'patient_vitals_2025_08']
+    assert {params['lock_timeout'] for _, params in engine.statements("SELECT set_config")} == {'5000'}
+
+
+def test_create_partition_moves_default_rows_before_attaching():
+    engine = FakeEngine([])
+    partitions.create_partition(engine, 'patient_vitals', 'recorded_at', date(2024, 12, 1))
+    create, move, attach = [sql for sql, _ in engine.executed]
+    assert create.startswith("CREATE TABLE humatrace.patient_vitals_2024_12 (LIKE humatrace.patient_vitals")
+    assert "DELETE FROM humatrace.patient_vitals_default WHERE recorded_at >= :start AND recorded_at < :end" in move
+    assert "INSERT INTO humatrace.patient_vitals_2024_12 SELECT * FROM moved" in move
+    assert engine.executed[1][1] == {'start': date(2024, 12, 1), 'end': date(2025, 1, 1)}
+    assert attach.endswith("FOR VALUES FROM ('2024-12-01') TO ('2025-01-01')")
+
+
+@pytest.mark.parametrize('drop, last', [
+    (False, "ALTER TABLE humatrace.patient_vitals_2024_12 SET SCHEMA humatrace_archive"),
+    (True, "DROP TABLE humatrace.patient_vitals_2024_12"),
+])
+def test_detach_expired(drop, last):
+    engine = FakeEngine([date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1)])
+    detached = partitions.detach_expired(engine, 5, drop=drop, today=date(2025, 6, 17))
+    assert detached == ['patient_vitals_2024_11', 'patient_vitals_2024_12']
+    assert len(engine.statements("ALTER TABLE humatrace.patient_vitals DETACH PARTITION")) == 2
+    assert engine.executed[-1][0] == last
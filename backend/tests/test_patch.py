@@ -0,0 +1,66 @@
+# backend/tests/test_patch.py
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from crud import parse_patch_body
+from extensions import db
+from routes.issue import issues
+from routes.patient import patients
+
+ID = str(uuid.uuid4())
+
+
+@pytest.mark.parametrize('body', [[], {}, {'secret': 1}, {'phone': '1', 'version': '2'},
+                                  {'phone': '1', 'version': True}, ['phone']])
+def test_patch_rejects_bad_bodies(client, body):
+    assert client.patch(f'/patient/{ID}', json=body).status_code == 400
+
+
+def test_parse_patch_body_orders_columns(app):
+    with app.test_request_context(json={'phone': '555', 'first_name': 'Ada', 'version': 3}):
+        columns, data, version = parse_patch_body(patients)
+    assert columns == ('first_name', 'phone')
+    assert version == 3
+    with app.test_request_context(json={'created_at': '2025-01-01T00:00:00'}):
+        with pytest.raises(ValueError):
+            parse_patch_body(issues)
+
+
+def test_patch_statements_are_cached_per_column_set():
+    plain = patients.patch_sql(('phone',), False)
+    assert patients.patch_sql(('phone',), False) is plain
+    assert "SET phone = :phone, version = version + 1 WHERE id = :id RETURNING" in plain.text
+    checked = patients.patch_sql(('phone',), True)
+    assert checked is not plain
+    assert "WHERE id = :id AND version = :version" in checked.text
+
+
+@pytest.fixture
+def stored_version(app, monkeypatch):
+    # The patched row is at version 5; a PATCH naming another version
+    # updates nothing, and the follow-up lookup reports the current one.
+    def execute(statement, params):
+        if statement is patients.version_sql:
+            row = SimpleNamespace(version=5)
+        elif params['version'] in (None, 5):
+            row = SimpleNamespace(version=6)
+        else:
+            row = None
+        return SimpleNamespace(fetchone=lambda: row)
+
+    monkeypatch.setattr(db.session, 'execute', execute)
+    for name in ('commit', 'rollback'):
+        monkeypatch.setattr(db.session, name, lambda: None)
+
+
+@pytest.mark.parametrize('body, status, reply', [
+    ({'phone': '555'}, 200, {"message": "Patient updated", "version": 6}),
+    ({'phone': '555', 'version': 5}, 200, {"message": "Patient updated", "version": 6}),
+    ({'phone': '555', 'version': 4}, 409, {"error": "Patient was modified by another request", "version": 5}),
+])
+def test_patch_checks_the_row_version(client, stored_version, body, status, reply):
+    response = client.patch(f'/patient/{ID}', json=body)
+    assert response.status_code == status
+    assert response.json == reply
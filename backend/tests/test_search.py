@@ -0,0 +1,49 @@
+# backend/tests/test_search.py
+from datetime import date
+
+import pytest
+
+from routes.patient import patient_search
+from search import birth_date_range
+
+
+@pytest.mark.parametrize('q, expected', [
+    ('1990-05-15', (date(1990, 5, 15), date(1990, 5, 16))),
+    ('1990-05', (date(1990, 5, 1), date(1990, 6, 1))),
+    ('1990-12', (date(1990, 12, 1), date(1991, 1, 1))),
+    ('1990', (date(1990, 1, 1), date(1991, 1, 1))),
+    ('9999-11', (date(9999, 11, 1), date(9999, 12, 1))),
+])
+def test_birth_date_range(q, expected):
+    assert birth_date_range(q) == expected
+
+
+# Out-of-range dates (often phone fragments) skip the birth-date arm.
+@pytest.mark.parametrize('q', ['0000', '9999', '9999-12', '9999-12-31', '1990-13', '1990-00',
+                               '2024-02-30', 'jan', '555-0100'])
+def test_birth_date_range_rejects(q):
+    assert birth_date_range(q) is None
+
+
+@pytest.mark.parametrize('q, arms', [
+    ('ada', ()),
+    ('555-0100', ('phone',)),
+    ('1990-05', ('phone', 'birth_date')),
+    ('1990', ('phone', 'birth_date')),
+])
+def test_arms_follow_the_shape_of_q(q, arms):
+    assert patient_search.arms(q) == arms
+
+
+def test_sql_only_includes_applicable_arms():
+    sql = patient_search.sql((), None).text
+    assert 'LIKE :phone_like' not in sql and ':dob_from' not in sql
+    assert 'GREATEST' not in sql
+    sql = patient_search.sql(('phone', 'birth_date'), ('id', 'first_name')).text
+    assert sql.startswith("SELECT id, first_name, round((GREATEST(")
+    assert 'LIKE :phone_like' in sql and 'date_of_birth >= :dob_from' in sql
+
+
+@pytest.mark.parametrize('query', ['q=a', 'q=ada&limit=x', 'q=ada&fields=secret'])
+def test_bad_search_args_are_400(client, query):
+    assert client.get(f'/patient/search?{query}').status_code == 400
@@ -0,0 +1,85 @@
+# backend/warmup.py
+import threading
+import time
+
+from flask import current_app
+from sqlalchemy import text
+from werkzeug.datastructures import MultiDict
+
+from dashboard import start_refresher
+from extensions import db
+from pagination import build_list_query
+
+WARMUP_ID = '00000000-0000-0000-0000-000000000000'
+_background_lock = threading.Lock()
+
+
+def reset_engines(app):
+    # A forked worker inherits the parent's pooled sockets; drop them without
+    # closing (the parent still owns them) so the child opens its own.
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
+
+
+def warm_pool(app):
+    # Open DB_POOL_SIZE connections up front so the first requests do not
+    # pay for TCP/auth/startup round trips.
+    connections = []
+    try:
+        for _ in range(app.config['DB_POOL_SIZE']):
+            conn = db.engine.connect()
+            conn.execute(text("SELECT 1"))
+            connections.append(conn)
+    finally:
+        for conn in connections:
+            conn.close()
+    return len(connections)
+
+
+def warm_statements(app):
+    # Run every entity's by-id and default list query once so SQLAlchemy's
+    # compiled cache and PostgreSQL's catalog caches are populated.
+    count = 0
+    args = MultiDict({'limit': '1'})
+    for blueprint in app.blueprints.values():
+        entity = getattr(blueprint, 'entity', None)
+        if entity is None:
+            continue
+        sql, params, _, _ = build_list_query(
+            entity.table, entity.filters, entity.sortable, args, time_column=entity.time_column
+        )
+        db.session.execute(sql, params).all()
+        db.session.execute(entity.select_one_sql, {'id': WARMUP_ID}).first()
+        count += 2
+    db.session.rollback()
+    return count
+
+
+def warm_up(app):
+    # Called once per worker before it accepts traffic; GET /health/ready
+    # answers 503 until this has finished.
+    started = time.perf_counter()
+    with app.app_context():
+        connections = warm_pool(app)
+        statements = warm_statements(app)
+        db.session.remove()
+    app.extensions['warmup'] = {
+        'connections': connections,
+        'statements': statements,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def start_background(app):
+    # Warm-up plus the dashboard refresher, once per serving process. gunicorn
+    # calls this after fork and asgi.py at lifespan startup; anything else
+    # gets it from the first request it serves (see create_app).
+    with _background_lock:
+        if 'warmup' not in app.extensions:
+            warm_up(app)
+        start_refresher(app)
+
+
+def is_ready():
+    return 'warmup' in current_app.extensions
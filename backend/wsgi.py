@@ -0,0 +1,16 @@
+# backend/wsgi.py
+#
+# Production entry point: gunicorn -c gunicorn.conf.py wsgi:app
+# gunicorn.conf.py preloads this module in the master, resets the engine and
+# warms each worker after fork. Other prefork servers (e.g. uWSGI) get the
+# engine reset from the fork hook below and warm up on their first request
+# (or call warmup.start_background(app) from their post-fork hook).
+import os
+
+from app import create_app
+from warmup import reset_engines
+
+app = create_app()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=lambda: reset_engines(app))